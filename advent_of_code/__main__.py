@@ -0,0 +1,182 @@
+import os
+
+import click
+
+from advent_of_code.cache import MAX_ENTRIES, ResultCache
+from advent_of_code.history import (
+    append_records,
+    compare as compare_history,
+    format_comparisons,
+    git_commit,
+    latest_commit,
+    load_history,
+)
+from advent_of_code.registry import discover_days, parse_days
+from advent_of_code.runner import (
+    Task,
+    Unit,
+    bench_units,
+    format_benchmark,
+    format_memory,
+    format_results,
+    memory_units,
+    parse_instance,
+    run_units,
+    write_json,
+)
+from advent_of_code.startup import format_startup, startup_record
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option("--days", default=None, help="Days to run, e.g. '1-5,7'. Defaults to all days.")
+@click.option(
+    "--sizes",
+    default="small,big",
+    show_default=True,
+    help="Instances to run: small, big or generated:<scale>[:<seed>].",
+)
+@click.option(
+    "--jobs",
+    type=int,
+    help="Number of worker processes.  [default: number of cores, 1 with --bench]",
+)
+@click.option("--bench", is_flag=True, help="Benchmarks parsing and both tasks instead.")
+@click.option("--repeat", default=10, show_default=True, help="Measured runs per phase.")
+@click.option("--warmup", default=1, show_default=True, help="Unmeasured runs per phase.")
+@click.option("--memory", is_flag=True, help="Traces memory of parsing and both tasks instead.")
+@click.option("--top", default=5, show_default=True, help="Allocation sites reported per phase.")
+@click.option("--json", "json_path", help="Writes benchmark results as JSON ('-' for stdout).")
+@click.option("--save", is_flag=True, help="Appends benchmark results to the local history.")
+@click.option("--no-cache", is_flag=True, help="Solves every task, ignoring cached answers.")
+@click.option(
+    "--cache-size", default=MAX_ENTRIES, show_default=True, help="Answers kept in the cache."
+)
+@click.option(
+    "--startup-report", is_flag=True, help="Reports cold import time of every day instead."
+)
+def run(
+    days: str,
+    sizes: str,
+    jobs: int,
+    bench: bool,
+    repeat: int,
+    warmup: int,
+    memory: bool,
+    top: int,
+    json_path: str,
+    save: bool,
+    no_cache: bool,
+    cache_size: int,
+    startup_report: bool,
+):
+    """
+    Runs all tasks of the selected days in parallel and reports a summary table.
+    """
+    available = discover_days()
+    try:
+        selected = parse_days(days) if days else list(available)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--days")
+
+    missing = [day for day in selected if day not in available]
+    if missing:
+        raise click.BadParameter(f"No solution for days {missing}", param_hint="--days")
+
+    try:
+        instance_sizes = [parse_instance(size) for size in sizes.split(",")]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--sizes")
+
+    if startup_report:
+        # one day at a time, parallel imports would compete for the disk and the cores
+        records = [startup_record(day) for day in selected]
+        if json_path:
+            write_json(records, json_path)
+        if json_path != "-":
+            click.echo(format_startup(records))
+        return
+
+    if jobs is None:
+        # parallel runs compete for the cores, that distorts the timings
+        jobs = 1 if bench else os.cpu_count()
+
+    days_and_sizes = [(day, size) for day in selected for size in instance_sizes]
+    if bench:
+        if save and jobs > 1:
+            raise click.UsageError("Only benchmarks of a single job can be saved.")
+        records = bench_units(days_and_sizes, repeat=repeat, warmup=warmup, jobs=jobs)
+        if json_path:
+            write_json(records, json_path)
+        if save:
+            append_records(records, commit=git_commit())
+        if json_path != "-":
+            click.echo(format_benchmark(records))
+        return
+
+    if memory:
+        records = memory_units(days_and_sizes, top=top, jobs=jobs)
+        if json_path:
+            write_json(records, json_path)
+        if json_path != "-":
+            click.echo(format_memory(records))
+        return
+
+    units = [
+        Unit(day=day, instance_size=instance_size, task=task)
+        for day in selected
+        for instance_size in instance_sizes
+        for task in Task
+    ]
+
+    cache = None if no_cache else ResultCache.load(max_entries=cache_size)
+    results = run_units(units, jobs=jobs, cache=cache)
+    click.echo(format_results(results))
+
+    if cache is not None:
+        cache.save()
+        click.echo(cache.format_stats())
+
+    if any(result.status in ("fail", "error") for result in results):
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("baseline")
+@click.argument("candidate", required=False)
+@click.option(
+    "--threshold",
+    default=0.1,
+    show_default=True,
+    help="Relative slowdown of the median that counts as a regression.",
+)
+def compare(baseline: str, candidate: str, threshold: float):
+    """
+    Compares benchmark medians of two commits stored in the local history.
+
+    CANDIDATE defaults to the most recently saved commit. Abbreviated hashes are accepted.
+    """
+    history = load_history()
+    candidate = candidate or latest_commit(history)
+    if candidate is None:
+        raise click.UsageError("No benchmarks saved yet, run with `--bench --save` first.")
+
+    try:
+        comparisons = compare_history(history, baseline=baseline, candidate=candidate)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    if not comparisons:
+        raise click.UsageError(f"No common benchmarks for {baseline} and {candidate}.")
+
+    click.echo(format_comparisons(comparisons, threshold))
+
+    if any(comparison.is_regression(threshold) for comparison in comparisons):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,102 @@
+from typing import Callable, Iterable, Type
+from dataclasses import asdict, dataclass
+from math import ceil
+from statistics import median, pstdev
+import time
+
+PHASES = ("parse", "task_one", "task_two", "solve_both")
+
+
+def percentile(samples: list[int], percent: float) -> int:
+    """
+    Nearest-rank percentile, always returns one of the samples.
+
+        >>> percentile([4, 1, 3, 2], 50)
+        2
+
+        >>> percentile(list(range(1, 101)), 95)
+        95
+
+        >>> percentile([7], 95)
+        7
+    """
+    ordered = sorted(samples)
+    rank = max(1, ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class Stats:
+    repeat: int
+    min_ns: int
+    median_ns: float
+    p95_ns: int
+    stddev_ns: float
+
+    @classmethod
+    def from_samples(cls, samples: list[int]) -> "Stats":
+        """
+        >>> Stats.from_samples([30, 10, 20])
+        Stats(repeat=3, min_ns=10, median_ns=20, p95_ns=30, stddev_ns=8.16496580927726)
+        """
+        return cls(
+            repeat=len(samples),
+            min_ns=min(samples),
+            median_ns=median(samples),
+            p95_ns=percentile(samples, 95),
+            stddev_ns=pstdev(samples),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def measure(func: Callable[[], object], repeat: int = 1, warmup: int = 0) -> Stats:
+    """
+    Calls `func` `warmup` times without measuring and then `repeat` times with measuring.
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        tic = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - tic)
+
+    return Stats.from_samples(samples)
+
+
+def benchmark_puzzle(
+    puzzle_class: Type, lines: Iterable[str], repeat: int = 1, warmup: int = 0
+) -> dict[str, Stats]:
+    """
+    Measures parsing and both tasks separately, plus `solve_both` if the puzzle implements it.
+    Tasks are run repeatedly on a single parsed instance, they must not modify the puzzle.
+    """
+    lines = list(lines)
+    puzzle = puzzle_class.from_lines(lines)
+
+    stats = {
+        "parse": measure(lambda: puzzle_class.from_lines(lines), repeat=repeat, warmup=warmup),
+        "task_one": measure(puzzle.task_one, repeat=repeat, warmup=warmup),
+        "task_two": measure(puzzle.task_two, repeat=repeat, warmup=warmup),
+    }
+    if puzzle_class.supports_solve_both():
+        stats["solve_both"] = measure(puzzle.solve_both, repeat=repeat, warmup=warmup)
+
+    return stats
+
+
+def saved_ns(stats: dict[str, Stats]) -> float:
+    """
+    Median time saved by `solve_both` compared to running the tasks one after another.
+
+        >>> stats = {
+        ...     phase: Stats(repeat=1, min_ns=ns, median_ns=ns, p95_ns=ns, stddev_ns=0.0)
+        ...     for phase, ns in [("task_one", 40), ("task_two", 60), ("solve_both", 70)]
+        ... }
+        >>> saved_ns(stats)
+        30
+    """
+    return stats["task_one"].median_ns + stats["task_two"].median_ns - stats["solve_both"].median_ns
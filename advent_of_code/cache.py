@@ -0,0 +1,121 @@
+from typing import Iterable, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import json
+
+REPOSITORY_DIRECTORY = Path(__file__).parent.parent
+CACHE_PATH = REPOSITORY_DIRECTORY / ".cache" / "results.json"
+MAX_ENTRIES = 1024
+
+
+@lru_cache(maxsize=None)
+def file_digest(path: Path) -> str:
+    """
+    Hash of the file content, computed once per process.
+    """
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def sources_digest(paths: Iterable[Path]) -> str:
+    """
+    Hash of the names and contents of the files, read every time, so it notices edits.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(f"{path.parent.name}/{path.name}\0".encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+
+    return digest.hexdigest()
+
+
+def code_digest(day_directory: Path) -> str:
+    """
+    Hash of the code a day runs: its own package and every shared module of the package above,
+    solutions import those. Other days don't matter.
+
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     day = Path(directory) / "day_01"
+        ...     day.mkdir()
+        ...     _ = (day / "solution.py").write_text("from grid import Grid")
+        ...     _ = (Path(directory) / "grid.py").write_text("class Grid: ...")
+        ...     before = cache_key(1, code_digest(day), "input", "one")
+        ...     _ = (Path(directory) / "grid.py").write_text("class Grid: pass")
+        ...     before == cache_key(1, code_digest(day), "input", "one")
+        False
+    """
+    return sources_digest([*day_directory.parent.glob("*.py"), *day_directory.glob("*.py")])
+
+
+def cache_key(day: int, solution_digest: str, input_digest: str, task: str) -> str:
+    """
+    >>> cache_key(1, "ab", "cd", "one")
+    '1:ab:cd:one'
+    """
+    return f"{day}:{solution_digest}:{input_digest}:{task}"
+
+
+@dataclass
+class ResultCache:
+    """
+    Answers of previous runs, the least recently used ones are dropped once there are more than
+    `max_entries`.
+
+        >>> cache = ResultCache(path=Path("unused.json"), max_entries=2)
+        >>> cache.put("a", "1")
+        >>> cache.put("b", "2")
+        >>> cache.get("a")
+        '1'
+        >>> cache.put("c", "3")
+        >>> cache.get("b") is None
+        True
+        >>> cache.format_stats()
+        'Cache: 1 hits, 1 misses, 2 entries'
+    """
+
+    path: Path = CACHE_PATH
+    max_entries: int = MAX_ENTRIES
+    # from the least to the most recently used
+    entries: OrderedDict[str, str] = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH, max_entries: int = MAX_ENTRIES) -> "ResultCache":
+        cache = cls(path=path, max_entries=max_entries)
+        if path.exists():
+            with path.open() as f:
+                cache.entries.update(json.load(f))
+            cache.evict()
+
+        return cache
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w") as f:
+            # list of pairs keeps the order of use
+            json.dump(list(self.entries.items()), f)
+
+    def get(self, key: str) -> Optional[str]:
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: str, answer: str):
+        self.entries[key] = answer
+        self.entries.move_to_end(key)
+        self.evict()
+
+    def evict(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def format_stats(self) -> str:
+        return f"Cache: {self.hits} hits, {self.misses} misses, {len(self.entries)} entries"
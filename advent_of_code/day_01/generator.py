@@ -0,0 +1,19 @@
+from typing import Iterator
+import random
+
+OFFICIAL_LINES = 2000
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields depth measurements of a slowly descending sea floor.
+
+        >>> list(generate(scale=0.002, seed=1))
+        ['100\\n', '96\\n', '106\\n', '100\\n']
+    """
+    rng = random.Random(seed)
+    depth = 100
+
+    for _ in range(max(1, round(OFFICIAL_LINES * scale))):
+        yield f"{depth}\n"
+        depth = max(0, depth + rng.randint(-8, 10))
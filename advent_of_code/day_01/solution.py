@@ -1,7 +1,8 @@
 from typing import Iterable
 from dataclasses import dataclass
+from collections import deque
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
 
 
 @dataclass
@@ -12,6 +13,31 @@ class Puzzle(PuzzleTemplate):
     def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
         return cls([int(line.strip()) for line in lines])
 
+    @classmethod
+    def solve_stream(cls, lines: Iterable[str]) -> tuple[int, int]:
+        """
+        Solves both tasks in a single pass, remembering only the last three numbers.
+
+        Windows `n_(i-1) + n_i + n_(i+1)` and `n_i + n_(i+1) + n_(i+2)` share two numbers, so
+        the second window is bigger exactly when `n_(i+2) > n_(i-1)`.
+
+            >>> Puzzle.solve_stream(["199", "200", "208", "210", "200", "207", "240", "269"])
+            (6, 3)
+        """
+        window = deque(maxlen=3)
+        increase_one = 0
+        increase_two = 0
+
+        for line in lines:
+            number = int(line)
+            if window and number > window[-1]:
+                increase_one += 1
+            if len(window) == 3 and number > window[0]:
+                increase_two += 1
+            window.append(number)
+
+        return increase_one, increase_two
+
     def task_one(self) -> int:
         """
         Given a sequence of numbers `n_0, n_1, ..., n_m`, returns how many times `n_i > n_(i-1)`
@@ -0,0 +1,15 @@
+from typing import Iterator
+import random
+
+OFFICIAL_LINES = 1000
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields submarine commands, going down more often than up so the depth stays positive.
+    """
+    rng = random.Random(seed)
+    directions = ["forward"] * 5 + ["down"] * 3 + ["up"] * 2
+
+    for _ in range(max(1, round(OFFICIAL_LINES * scale))):
+        yield f"{rng.choice(directions)} {rng.randint(1, 9)}\n"
@@ -1,7 +1,7 @@
 from typing import Iterable
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
 
 
 @dataclass
@@ -13,6 +13,34 @@ class Puzzle(PuzzleTemplate):
         raw_in = (line.strip().split() for line in lines)
         return cls(instructions=[(direction, int(unit)) for direction, unit in raw_in])
 
+    @classmethod
+    def solve_stream(cls, lines: Iterable[str]) -> tuple[int, int]:
+        """
+        Solves both tasks in a single pass. The depth of the first task is the aim of the second.
+
+            >>> lines = ["forward 5", "down 5", "forward 8", "up 3", "down 8", "forward 2"]
+            >>> Puzzle.solve_stream(lines)
+            (150, 900)
+        """
+        horizontal = 0
+        aim = 0
+        depth = 0
+
+        for line in lines:
+            direction, raw_unit = line.split()
+            unit = int(raw_unit)
+            if direction == "forward":
+                horizontal += unit
+                depth += aim * unit
+            elif direction == "up":
+                aim -= unit
+            elif direction == "down":
+                aim += unit
+            else:
+                raise Exception(f"Unknown direction {direction}")
+
+        return horizontal * aim, horizontal * depth
+
     def task_one(self) -> int:
         horizontal = 0
         depth = 0
@@ -0,0 +1,21 @@
+from typing import Iterator
+import random
+
+OFFICIAL_LINES = 1000
+OFFICIAL_WIDTH = 12
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields unique binary numbers of equal width. Numbers must be unique, otherwise filtering
+    in task two could never end with a single one, so the width grows with the scale.
+
+        >>> list(generate(scale=0.003, seed=1))
+        ['010001001100\\n', '001000000100\\n', '100000101001\\n']
+    """
+    rng = random.Random(seed)
+    lines = max(1, round(OFFICIAL_LINES * scale))
+    width = max(OFFICIAL_WIDTH, lines.bit_length() + 2)
+
+    for number in rng.sample(range(2**width), lines):
+        yield f"{number:0{width}b}\n"
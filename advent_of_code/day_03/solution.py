@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from enum import IntEnum
 from collections import Counter
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
 
 
 class Commonality(IntEnum):
@@ -63,9 +63,8 @@ def most_frequent(sequence: Iterable[str]) -> tuple[str, str]:
     return most_common[0], least_common[0]
 
 
-def filter_until_one(lines: list[str], commonality: Commonality) -> str:
+def filter_until_one(lines: list[str], commonality: Commonality, index: int = 0) -> str:
     _lines = list(lines)
-    index = 0
 
     while len(_lines) != 1:
         match = most_frequent((line[index] for line in _lines))[commonality]
@@ -83,9 +82,12 @@ class Puzzle(PuzzleTemplate):
     def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
         return cls(lines=[line.strip() for line in lines])
 
-    def task_one(self) -> int:
+    def column_frequencies(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
         rotate = zip(*self.lines)
-        most_frequent_raw, least_frequent_raw = zip(*(most_frequent(seq) for seq in rotate))
+        return tuple(zip(*(most_frequent(seq) for seq in rotate)))
+
+    def task_one(self) -> int:
+        most_frequent_raw, least_frequent_raw = self.column_frequencies()
 
         return binary_str_to_decimal(most_frequent_raw) * binary_str_to_decimal(least_frequent_raw)
 
@@ -94,3 +96,29 @@ class Puzzle(PuzzleTemplate):
         second = filter_until_one(self.lines, commonality=Commonality.LEAST_COMMON)
 
         return binary_str_to_decimal(first) * binary_str_to_decimal(second)
+
+    def solve_both(self) -> tuple[int, int]:
+        """
+        The first filtering step of both ratings uses the first column frequencies, which task
+        one has already computed.
+
+            >>> lines = ["00100", "11110", "10110", "10111", "10101", "01111", "00111", "11100"]
+            >>> lines += ["10000", "11001", "00010", "01010"]
+            >>> Puzzle.from_lines(lines).solve_both()
+            (198, 230)
+        """
+        most_frequent_raw, least_frequent_raw = self.column_frequencies()
+        one = binary_str_to_decimal(most_frequent_raw) * binary_str_to_decimal(least_frequent_raw)
+
+        first = filter_until_one(
+            [line for line in self.lines if line[0] == most_frequent_raw[0]],
+            commonality=Commonality.MOST_COMMON,
+            index=1,
+        )
+        second = filter_until_one(
+            [line for line in self.lines if line[0] == least_frequent_raw[0]],
+            commonality=Commonality.LEAST_COMMON,
+            index=1,
+        )
+
+        return one, binary_str_to_decimal(first) * binary_str_to_decimal(second)
@@ -0,0 +1,24 @@
+from typing import Iterator
+import random
+
+OFFICIAL_BOARDS = 100
+OFFICIAL_NUMBERS = 100
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields the drawn numbers followed by bingo boards. All numbers get drawn, so every board
+    eventually wins.
+    """
+    rng = random.Random(seed)
+    numbers = max(25, round(OFFICIAL_NUMBERS * scale**0.5))
+
+    drawn = list(range(numbers))
+    rng.shuffle(drawn)
+    yield ",".join(map(str, drawn)) + "\n"
+
+    for _ in range(max(1, round(OFFICIAL_BOARDS * scale))):
+        board = rng.sample(range(numbers), 25)
+        yield "\n"
+        for row in range(5):
+            yield " ".join(str(number).rjust(2) for number in board[row * 5 : row * 5 + 5]) + "\n"
@@ -1,6 +1,7 @@
 from typing import Iterable
 from copy import deepcopy
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.display import show
+from advent_of_code.puzzle import PuzzleTemplate
 from dataclasses import dataclass, field
 
 
@@ -99,8 +100,7 @@ class Puzzle(PuzzleTemplate):
         for number in self._input:
             for board_num, board in enumerate(boards):
                 if board.call_number(number):
-                    print(f"Bingo! on board {board_num} \n")
-                    print(f"{board}\n")
+                    show(lambda: f"Bingo! on board {board_num} \n\n{board}\n")
                     return board.score(number)
 
     def task_two(self) -> int:
@@ -116,6 +116,5 @@ class Puzzle(PuzzleTemplate):
                     boards_remaining -= 1
 
                     if boards_remaining == 0:
-                        print(f"Bingo! on last board {board_num} \n")
-                        print(f"{board}\n")
+                        show(lambda: f"Bingo! on last board {board_num} \n\n{board}\n")
                         return board.score(number)
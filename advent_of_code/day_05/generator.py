@@ -0,0 +1,33 @@
+from typing import Iterator
+import random
+
+OFFICIAL_SEGMENTS = 500
+OFFICIAL_EXTENT = 1000
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields horizontal, vertical and diagonal segments. The number of segments grows with the
+    scale and the covered area as well, so the density of overlaps stays similar.
+
+        >>> list(generate(scale=0.004, seed=1))
+        ['8,36 -> 16,36\\n', '7,31 -> 7,30\\n']
+    """
+    rng = random.Random(seed)
+    extent = max(10, round(OFFICIAL_EXTENT * scale**0.5))
+
+    for _ in range(max(1, round(OFFICIAL_SEGMENTS * scale))):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        direction = rng.randrange(3)
+        if direction == 0:
+            x2, y2 = rng.randrange(extent), y1
+        elif direction == 1:
+            x2, y2 = x1, rng.randrange(extent)
+        else:
+            # 45 degree diagonal, clipped to stay in the area
+            dx, dy = rng.choice((-1, 1)), rng.choice((-1, 1))
+            max_length = min(x1 if dx < 0 else extent - 1 - x1, y1 if dy < 0 else extent - 1 - y1)
+            length = rng.randint(0, max_length)
+            x2, y2 = x1 + dx * length, y1 + dy * length
+
+        yield f"{x1},{y1} -> {x2},{y2}\n"
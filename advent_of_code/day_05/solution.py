@@ -1,8 +1,28 @@
-from collections import Counter
-from typing import Iterable, NamedTuple
+from collections import Counter, defaultdict
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass, field
+import math
+import sys
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
+from advent_of_code.utils import check_backend, import_numpy, numpy_available
+
+BACKENDS = ("auto", "sparse", "dense")
+# the dense backend keeps a cell per point of a band of the bounding box and a few arrays per
+# point of the segments, the latter are rasterized in chunks of this many points
+MAX_DENSE_CELLS = 2**24
+RASTER_CHUNK = 2**20
+DENSE_CELLS_PER_PAIR = 100
+# below that the sweep is faster than setting up the dense arrays
+MIN_DENSE_SEGMENTS = 100
+# importing NumPy takes about 130 ms, as long as the sweep over this many segments
+MIN_COLD_DENSE_SEGMENTS = 1000
+
+# segments lie on lines a * x + b * y = key, (a, b) of every family of lines
+HORIZONTAL, VERTICAL, DIAGONAL, ANTI_DIAGONAL = range(4)
+FAMILIES = ((0, 1), (1, 0), (1, -1), (1, 1))
 
 
 class Point(NamedTuple):
@@ -38,9 +58,261 @@ class Point(NamedTuple):
         Point(-1, 1)
 
         """
-        nx = self.x / abs(self.x) if self.x else 0
-        ny = self.y / abs(self.y) if self.y else 0
-        return self.__class__(int(nx), int(ny))
+        return self.__class__(sign(self.x), sign(self.y))
+
+
+def sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+class Span(NamedTuple):
+    """
+    Segment as a closed interval on its line. The interval is in x coordinates, in y for
+    vertical lines.
+    """
+
+    family: int
+    key: int
+    start: int
+    end: int
+
+    def parameter(self, x: int, y: int) -> int:
+        return y if self.family == VERTICAL else x
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        Whether the point of the line is part of the span.
+        """
+        return self.start <= self.parameter(x, y) <= self.end
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        """
+        Smallest and largest x, then smallest and largest y of the span.
+
+            >>> Segment.from_str("8,0 -> 2,6").span().bounds()
+            (2, 8, 0, 6)
+        """
+        key, start, end = self.key, self.start, self.end
+        if self.family == HORIZONTAL:
+            return start, end, key, key
+        if self.family == VERTICAL:
+            return key, key, start, end
+        if self.family == DIAGONAL:
+            return start, end, start - key, end - key
+        return start, end, key - end, key - start
+
+
+def span_between(start_x: int, start_y: int, end_x: int, end_y: int) -> Span:
+    """
+    Span of the segment between two points.
+
+        >>> span_between(8, 0, 0, 8)
+        Span(family=3, key=8, start=0, end=8)
+    """
+    d_x, d_y = end_x - start_x, end_y - start_y
+    if d_x == 0 and d_y != 0:
+        family = VERTICAL
+    elif d_y == 0:
+        family = HORIZONTAL
+    else:
+        family = DIAGONAL if (d_x > 0) == (d_y > 0) else ANTI_DIAGONAL
+
+    a, b = FAMILIES[family]
+    if family == VERTICAL:
+        start, end = sorted((start_y, end_y))
+    else:
+        start, end = sorted((start_x, end_x))
+
+    return Span(family, a * start_x + b * start_y, start, end)
+
+
+def coverage(
+    intervals: list[tuple[int, int]],
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """
+    Merges closed intervals into the parts covered at least once and at least twice.
+
+        >>> coverage([(0, 5), (3, 8), (4, 4), (9, 9), (11, 12)])
+        ([(0, 9), (11, 12)], [(3, 5)])
+    """
+    # ends sort before starts at the same position, adjacent intervals are merged below
+    events = sorted(
+        [(start, 1) for start, _ in intervals] + [(end + 1, -1) for _, end in intervals]
+    )
+    covered: list[tuple[int, int]] = []
+    multi: list[tuple[int, int]] = []
+    starts = {}
+    depth = 0
+    for position, change in events:
+        new_depth = depth + change
+        for level, merged in ((1, covered), (2, multi)):
+            if depth < level <= new_depth:
+                starts[level] = position
+            elif new_depth < level <= depth:
+                if merged and merged[-1][1] + 1 == starts[level]:
+                    merged[-1] = (merged[-1][0], position - 1)
+                else:
+                    merged.append((starts[level], position - 1))
+        depth = new_depth
+
+    return covered, multi
+
+
+def crossing(first: Span, second: Span) -> Optional[tuple[int, int]]:
+    """
+    Integer point where spans of lines from two different families cross, if there is one.
+
+        >>> crossing(Segment.from_str("0,0 -> 4,4").span(), Segment.from_str("0,4 -> 4,0").span())
+        (2, 2)
+        >>> crossing(Segment.from_str("0,0 -> 3,3").span(), Segment.from_str("0,3 -> 3,0").span())
+    """
+    (a_1, b_1), (a_2, b_2) = FAMILIES[first.family], FAMILIES[second.family]
+    # Cramer's rule, the crossing of a diagonal and an anti-diagonal may lie between points
+    determinant = a_1 * b_2 - a_2 * b_1
+    x, x_rest = divmod(first.key * b_2 - second.key * b_1, determinant)
+    y, y_rest = divmod(a_1 * second.key - a_2 * first.key, determinant)
+    if x_rest or y_rest or not first.contains(x, y) or not second.contains(x, y):
+        return None
+
+    return x, y
+
+
+def count_overlaps(spans: Iterable[Span]) -> int:
+    """
+    Number of integer points covered by at least two spans, without visiting the points. Spans
+    on the same line overlap in intervals, spans on different lines cross in single points.
+    Points both in an overlap and a crossing are counted once.
+
+        >>> from advent_of_code.day_05.generator import generate
+        >>> segments = [Segment.from_str(line) for line in generate(scale=0.1, seed=3)]
+        >>> points = Counter(point for segment in segments for point in segment.segment_points())
+        >>> overlaps = count_overlaps(segment.span() for segment in segments)
+        >>> overlaps == sum(1 for count in points.values() if count > 1)
+        True
+    """
+    lines = defaultdict(list)
+    for span in spans:
+        lines[span.family, span.key].append((span.start, span.end))
+
+    covered_spans = []
+    multi = {}
+    overlaps = 0
+    for (family, key), intervals in lines.items():
+        covered, multi[family, key] = coverage(intervals)
+        covered_spans.extend(Span(family, key, start, end) for start, end in covered)
+        overlaps += sum(end - start + 1 for start, end in multi[family, key])
+
+    # covered spans of one line are disjoint and parallel lines never cross, so only spans of
+    # different families are paired, those with overlapping bounds are found by a sweep over x
+    crossings = defaultdict(set)
+    active: list[tuple[int, int, int, Span]] = []
+    for left, right, bottom, top, span in sorted(span.bounds() + (span,) for span in covered_spans):
+        active = [entry for entry in active if entry[0] >= left]
+        for _, other_bottom, other_top, other in active:
+            if other_bottom <= top and bottom <= other_top and other.family != span.family:
+                point = crossing(span, other)
+                if point is not None:
+                    crossings[point].update((span[:2], other[:2]))
+        active.append((right, bottom, top, span))
+
+    overlaps += len(crossings)
+    for (x, y), point_lines in crossings.items():
+        for family, key in point_lines:
+            intervals = multi[family, key]
+            parameter = y if family == VERTICAL else x
+            index = bisect_right(intervals, (parameter, math.inf)) - 1
+            if index >= 0 and intervals[index][1] >= parameter:
+                overlaps -= 1  # already counted with the overlaps of the line
+
+    return overlaps
+
+
+def numpy_rasterize(counts: Any, first_cells: Any, cell_steps: Any, lengths: Any):
+    """
+    Adds the points of segments given by the index of their first cell, the index difference
+    from one point to the next and the number of points to the flat array of counts. Every
+    segment is repeated as often as it has points and advanced along its direction by the
+    position of the point within the segment.
+    """
+    np = import_numpy()
+    # chunks of whole segments with about `RASTER_CHUNK` points each
+    boundaries = np.searchsorted(
+        np.cumsum(lengths), np.arange(RASTER_CHUNK, lengths.sum(), RASTER_CHUNK)
+    )
+    for chunk in np.split(np.arange(len(lengths)), np.unique(boundaries + 1)):
+        chunk_lengths = lengths[chunk]
+        # position of every point within its segment
+        positions = np.arange(chunk_lengths.sum()) - np.repeat(
+            np.cumsum(chunk_lengths) - chunk_lengths, chunk_lengths
+        )
+        cells = np.repeat(first_cells[chunk], chunk_lengths)
+        cells += np.repeat(cell_steps[chunk], chunk_lengths) * positions
+        # an increment of the same type as the counts takes the fast path of add.at
+        np.add.at(counts, cells, counts.dtype.type(1))
+
+
+def numpy_count_overlaps(segments: "Segments") -> int:
+    """
+    Same as `count_overlaps` on the spans of the segments, by rasterizing the segments into a
+    dense array of counts. The bounding box is covered by bands of rows with at most
+    `MAX_DENSE_CELLS` cells, one at a time, segments are clipped to the rows of the band.
+
+        >>> from advent_of_code.day_05.generator import generate
+        >>> generated = Segments.from_lines(generate(scale=1, seed=1))
+        >>> long = Segments.from_lines(
+        ...     ["0,0 -> 9999,9999", "0,9999 -> 9999,0", "9999,0 -> 0,9999", "0,5000 -> 9999,5000"]
+        ... )
+        >>> not numpy_available() or all(
+        ...     numpy_count_overlaps(segments) == count_overlaps(segments.spans())
+        ...     for segments in (generated, generated.straight(), long)
+        ... )
+        True
+    """
+    np = import_numpy()
+    if not len(segments):
+        return 0
+
+    # views of the coordinate arrays, translated so the bounding box starts at 0, 0
+    min_x, _, min_y, _ = segments.bounds()
+    start_x, start_y, end_x, end_y = (
+        np.frombuffer(column, dtype=np.int64) - low
+        for column, low in zip(segments.columns(), (min_x, min_y, min_x, min_y))
+    )
+    width = int(max(start_x.max(), end_x.max())) + 1
+    height = int(max(start_y.max(), end_y.max())) + 1
+
+    lengths = np.maximum(np.abs(end_x - start_x), np.abs(end_y - start_y)) + 1
+    step_y = np.sign(end_y - start_y)
+    # cells are addressed by a single index, so is the step from one point to the next
+    first_cells = start_y * width + start_x
+    cell_steps = step_y * width + np.sign(end_x - start_x)
+
+    rows = max(1, MAX_DENSE_CELLS // width)
+    # a point can't be covered more often than there are segments
+    dtype = np.int16 if len(segments) <= np.iinfo(np.int16).max else np.int32
+    counts = np.zeros(min(rows, height) * width, dtype=dtype)
+    overlaps = 0
+    for top in range(0, height, rows):
+        bottom = min(top + rows, height) - 1
+        # positions of the first and last point of every segment within the band, horizontal
+        # segments are either fully inside or not at all
+        inside = (top <= start_y) & (start_y <= bottom)
+        to_top, to_bottom = (top - start_y) * step_y, (bottom - start_y) * step_y
+        first = np.where(step_y == 0, np.where(inside, 0, lengths), np.minimum(to_top, to_bottom))
+        last = np.where(step_y == 0, lengths - 1, np.maximum(to_top, to_bottom))
+        first, last = np.maximum(first, 0), np.minimum(last, lengths - 1)
+
+        crossing = np.flatnonzero(first <= last)
+        counts[:] = 0
+        numpy_rasterize(
+            counts,
+            first_cells[crossing] + cell_steps[crossing] * first[crossing] - top * width,
+            cell_steps[crossing],
+            (last - first + 1)[crossing],
+        )
+        overlaps += int(np.count_nonzero(counts > 1))
+
+    return overlaps
 
 
 @dataclass
@@ -76,6 +348,9 @@ class Segment:
         x, y = self.direction
         return x != 0 and y != 0
 
+    def span(self) -> Span:
+        return span_between(*self.start, *self.end)
+
     def segment_points(self) -> Iterable[Point]:
         """
         Returns all integer points this segment crosses.
@@ -95,25 +370,119 @@ class Segment:
             yield current
 
 
+@dataclass
+class Segments:
+    """
+    Segments as a structure of arrays, one array of machine integers per coordinate of the
+    ends. Takes a fraction of the memory of `Segment` objects and NumPy can view the arrays
+    without copying them.
+
+        >>> segments = Segments.from_lines(["0,9 -> 5,9", "8,0 -> 0,8", "7,0 -> 7,4"])
+        >>> segments.bounds()
+        (0, 8, 0, 9)
+        >>> list(segments.straight().spans())
+        [Span(family=0, key=9, start=0, end=5), Span(family=1, key=7, start=0, end=4)]
+    """
+
+    start_x: array
+    start_y: array
+    end_x: array
+    end_y: array
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Segments":
+        segments = cls(*(array("q") for _ in range(4)))
+        for line in lines:
+            coordinates = map(int, line.replace("->", ",").split(","))
+            for column, coordinate in zip(segments.columns(), coordinates):
+                column.append(coordinate)
+
+        return segments
+
+    def __len__(self) -> int:
+        return len(self.start_x)
+
+    def columns(self) -> tuple[array, array, array, array]:
+        return self.start_x, self.start_y, self.end_x, self.end_y
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        """
+        Smallest and largest x, then smallest and largest y of all ends.
+        """
+        return (
+            min(min(self.start_x), min(self.end_x)),
+            max(max(self.start_x), max(self.end_x)),
+            min(min(self.start_y), min(self.end_y)),
+            max(max(self.start_y), max(self.end_y)),
+        )
+
+    def straight(self) -> "Segments":
+        """
+        Only the horizontal and vertical segments.
+        """
+        straight = Segments(*(array("q") for _ in range(4)))
+        for ends in zip(*self.columns()):
+            start_x, start_y, end_x, end_y = ends
+            if start_x == end_x or start_y == end_y:
+                for column, coordinate in zip(straight.columns(), ends):
+                    column.append(coordinate)
+
+        return straight
+
+    def spans(self) -> Iterator[Span]:
+        return map(span_between, *self.columns())
+
+
 @dataclass
 class Puzzle(PuzzleTemplate):
-    segments: list[tuple[Point, Point]]
+    segments: Segments
+    backend: str = "auto"
+
+    def __post_init__(self):
+        check_backend(self.backend, BACKENDS)
 
     @classmethod
-    def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
-        return cls(segments=[Segment.from_str(line) for line in lines])
+    def from_lines(cls, lines: Iterable[str], backend: str = "auto") -> "Puzzle":
+        return cls(segments=Segments.from_lines(lines), backend=backend)
 
-    def task_one(self) -> int:
-        counter = Counter()
-        for segment in self.segments:
-            if not segment.is_diagonal():
-                counter.update(segment.segment_points())
+    @staticmethod
+    def select_backend(segments: Segments) -> str:
+        """
+        Rasterizing costs about a cell of the bounding box and a point of every segment, the
+        sparse sweep about a pair of segments. With NumPy doing the former, dense wins unless
+        the segments are few or spread over a large area. Until NumPy has been imported, that
+        has to pay off too, so more segments are needed. Without NumPy it is always sparse.
 
-        return sum(1 for v in counter.values() if v > 1)
+            >>> Puzzle.select_backend(Segments.from_lines(["0,0 -> 99,99"] * 10))
+            'sparse'
+            >>> Puzzle.select_backend(Segments.from_lines(["0,0 -> 999999,999999"] * 100))
+            'sparse'
+        """
+        imported = "numpy" in sys.modules
+        if len(segments) < (MIN_DENSE_SEGMENTS if imported else MIN_COLD_DENSE_SEGMENTS):
+            return "sparse"
 
-    def task_two(self) -> int:
-        counter = Counter()
-        for segment in self.segments:
-            counter.update(segment.segment_points())
+        min_x, max_x, min_y, max_y = segments.bounds()
+        area = (max_x - min_x + 1) * (max_y - min_y + 1)
+        if area > DENSE_CELLS_PER_PAIR * len(segments) ** 2:
+            return "sparse"
+
+        try:
+            import_numpy()
+        except ImportError:
+            return "sparse"
+
+        return "dense"
+
+    def count_overlaps(self, segments: Segments) -> int:
+        backend = self.select_backend(segments) if self.backend == "auto" else self.backend
+        if backend == "dense":
+            return numpy_count_overlaps(segments)
 
-        return sum(1 for v in counter.values() if v > 1)
+        return count_overlaps(segments.spans())
+
+    def task_one(self) -> int:
+        return self.count_overlaps(self.segments.straight())
+
+    def task_two(self) -> int:
+        return self.count_overlaps(self.segments)
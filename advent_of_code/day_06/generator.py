@@ -0,0 +1,17 @@
+from typing import Iterator
+import random
+
+OFFICIAL_FISH = 300
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields a single line of lanternfish timers.
+
+        >>> list(generate(scale=0.02, seed=1))
+        ['2,5,1,3,1,4\\n']
+    """
+    rng = random.Random(seed)
+    fish = max(1, round(OFFICIAL_FISH * scale))
+
+    yield ",".join(str(rng.randint(1, 5)) for _ in range(fish)) + "\n"
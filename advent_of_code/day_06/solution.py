@@ -1,8 +1,26 @@
 from collections import Counter
-from typing import Iterable
+from typing import Iterable, Optional
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.matrix import Matrix, Vector, transform_many
+from advent_of_code.puzzle import PuzzleTemplate
+
+TIMERS = 9
+
+
+def transition_matrix() -> Matrix:
+    """
+    One day as a linear map of the number of lanternfish per timer value, entry `[new][old]`
+    counts the fish with timer `new` that a fish with timer `old` turns into.
+    """
+    matrix = [[0] * TIMERS for _ in range(TIMERS)]
+    for timer in range(1, TIMERS):
+        matrix[timer - 1][timer] = 1
+    # reset counter of the group and spawn a newborn group
+    matrix[6][0] = 1
+    matrix[8][0] = 1
+
+    return matrix
 
 
 @dataclass
@@ -14,9 +32,8 @@ class Puzzle(PuzzleTemplate):
         line = next(iter(lines))
         return cls(Counter(int(timer) for timer in line.split(",")))
 
-    def task_one(self, days=80) -> int:
-        groups = self.groups
-
+    @staticmethod
+    def simulate(groups: Counter[int], days: int) -> Counter[int]:
         for _ in range(days):
             new_groups = Counter()
             for timer, count in groups.items():
@@ -29,7 +46,43 @@ class Puzzle(PuzzleTemplate):
                     new_groups[timer - 1] += count
             groups = new_groups
 
-        return sum(size for size in groups.values())
+        return groups
+
+    def state(self) -> Vector:
+        return [self.groups[timer] for timer in range(TIMERS)]
+
+    def count_many(self, days: Iterable[int], modulus: Optional[int] = None) -> list[int]:
+        """
+        Numbers of lanternfish after each of the given numbers of days, optionally modulo
+        `modulus`. Powers of the transition matrix take logarithmically many products in the
+        number of days, one set of them serves all the queries.
+
+            >>> puzzle = Puzzle.from_lines(["3,4,3,1,2"])
+            >>> puzzle.count_many([18, 80])
+            [26, 5934]
+            >>> puzzle.count_many([10**18], modulus=10**9 + 7)
+            [860170227]
+            >>> puzzle.count(1000) == sum(Puzzle.simulate(puzzle.groups, 1000).values())
+            True
+        """
+        states = transform_many(transition_matrix(), self.state(), days, modulus)
+        return [sum(state) % modulus if modulus else sum(state) for state in states]
+
+    def count(self, days: int, modulus: Optional[int] = None) -> int:
+        return self.count_many([days], modulus)[0]
+
+    def task_one(self, days=80) -> int:
+        return self.count(days)
 
     def task_two(self) -> int:
         return self.task_one(days=256)
+
+    def solve_both(self) -> tuple[int, int]:
+        """
+        Task two continues from the state of task one.
+
+            >>> Puzzle.from_lines(["3,4,3,1,2"]).solve_both()
+            (5934, 26984457539)
+        """
+        one, two = self.count_many([80, 256])
+        return one, two
@@ -0,0 +1,16 @@
+from typing import Iterator
+import random
+
+OFFICIAL_CRABS = 1000
+OFFICIAL_MAX_POSITION = 2000
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields a single line of crab positions, most of them close to the start.
+    """
+    rng = random.Random(seed)
+    crabs = max(1, round(OFFICIAL_CRABS * scale))
+
+    positions = (min(OFFICIAL_MAX_POSITION, int(rng.expovariate(1 / 400))) for _ in range(crabs))
+    yield ",".join(map(str, positions)) + "\n"
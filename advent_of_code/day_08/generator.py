@@ -0,0 +1,27 @@
+from typing import Iterator
+import random
+
+from advent_of_code.day_08.solution import LIT_SEGMENTS
+
+OFFICIAL_ENTRIES = 200
+SEGMENTS = "abcdefg"
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields entries of all ten scrambled patterns and four output digits, each entry with its
+    own random wiring of the segments.
+    """
+    rng = random.Random(seed)
+
+    for _ in range(max(1, round(OFFICIAL_ENTRIES * scale))):
+        wiring = dict(zip(SEGMENTS, rng.sample(SEGMENTS, len(SEGMENTS))))
+
+        def scrambled(digit: int) -> str:
+            segments = [wiring[segment] for segment in LIT_SEGMENTS[digit]]
+            rng.shuffle(segments)
+            return "".join(segments)
+
+        patterns = [scrambled(digit) for digit in rng.sample(range(10), 10)]
+        outputs = [scrambled(rng.randrange(10)) for _ in range(4)]
+        yield f"{' '.join(patterns)} | {' '.join(outputs)}\n"
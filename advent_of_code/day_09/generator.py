@@ -0,0 +1,43 @@
+from typing import Iterator
+import random
+
+OFFICIAL_SIDE = 100
+SPACING = 10
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields rows of a square height map with the area `scale` times the official one. Every block
+    of `SPACING` x `SPACING` cells has a randomly placed basin center, heights grow with the
+    distance to the nearest center.
+
+    Like in the official input every basin has a single low point and is enclosed by 9s: cells
+    about as close to another center, or too far for a height below 9, become walls.
+    """
+    rng = random.Random(seed)
+    side = max(3, round(OFFICIAL_SIDE * scale**0.5))
+    blocks = -(-side // SPACING)
+    centers = {
+        (block_row, block_col): (
+            block_row * SPACING + rng.randrange(SPACING),
+            block_col * SPACING + rng.randrange(SPACING),
+            rng.randrange(3),  # depth of the low point
+        )
+        for block_row in range(blocks)
+        for block_col in range(blocks)
+    }
+
+    for row in range(side):
+        heights = []
+        for col in range(side):
+            # centers further than the neighboring blocks are too far to matter
+            candidates = sorted(
+                abs(row - center_row) + abs(col - center_col) + depth
+                for block_row in range(row // SPACING - 1, row // SPACING + 2)
+                for block_col in range(col // SPACING - 1, col // SPACING + 2)
+                if (block_row, block_col) in centers
+                for center_row, center_col, depth in [centers[block_row, block_col]]
+            )
+            nearest, second = candidates[0], candidates[1] if len(candidates) > 1 else 99
+            heights.append(str(nearest if nearest < 9 and second - nearest >= 2 else 9))
+        yield "".join(heights) + "\n"
@@ -1,94 +1,215 @@
-from typing import Iterable, NamedTuple
+from typing import Iterable, Optional, Sequence
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
-from itertools import chain
+from advent_of_code.display import show
+from advent_of_code.grid import DIGITS, Grid
+from advent_of_code.puzzle import PuzzleTemplate
+from advent_of_code.utils import check_backend, import_numpy, numpy_available
 from functools import reduce
+from operator import itemgetter
+import heapq
 import operator
 
-
-class Point(NamedTuple):
-    row: int
-    col: int
+WALL = -1
+BACKENDS = ("python", "numpy")
+
+
+def find(parents: list[int], index: int) -> int:
+    """
+    Root of the set containing the index, halves the path on the way up.
+    """
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+
+    return index
+
+
+def union(parents: list[int], a: int, b: int):
+    root_a, root_b = find(parents, a), find(parents, b)
+    if root_a != root_b:
+        parents[root_a] = root_b
+
+
+def label_row(row: Sequence[int], upper: Optional[array], parents: list[int]) -> array:
+    """
+    Labels the cells of a row given the labels of the row above, see `Puzzle.basin_labels`.
+    New labels are added to `parents`, touching basins are united.
+    """
+    labels = array("q", [WALL]) * len(row)
+    label = WALL
+    for col, height in enumerate(row):
+        if height == 9:
+            label = WALL
+            continue
+
+        if upper is not None:
+            upper_label = upper[col]
+            if label == WALL:
+                label = upper_label
+            elif upper_label != WALL and upper_label != label:
+                union(parents, label, upper_label)
+
+        if label == WALL:
+            label = len(parents)
+            parents.append(label)
+        labels[col] = label
+
+    return labels
+
+
+def low_point_risk(
+    above: Optional[Sequence[int]], row: Sequence[int], below: Optional[Sequence[int]]
+) -> int:
+    """
+    Sum of the risk levels of the low points in a row, the rows above and below are None at the
+    border of the map.
+
+        >>> low_point_risk(None, bytes([2, 1, 9]), bytes([3, 9, 8]))
+        2
+    """
+    risk = 0
+    last = len(row) - 1
+    for col, height in enumerate(row):
+        if (
+            (col == 0 or row[col - 1] > height)
+            and (col == last or row[col + 1] > height)
+            and (above is None or above[col] > height)
+            and (below is None or below[col] > height)
+        ):
+            risk += height + 1
+
+    return risk
+
+
+def numpy_low_points(grid: Grid) -> list[int]:
+    """
+    Same as `Puzzle.low_points` with whole-array comparisons. The map is padded with a border of
+    10s, higher than any cell, so every cell is compared to four shifted copies of the map.
+
+        >>> from advent_of_code.day_09.generator import generate
+        >>> lines = list(generate(scale=0.1, seed=1))
+        >>> python = list(Puzzle.from_lines(lines).low_points())
+        >>> not numpy_available() or numpy_low_points(Grid.from_lines(lines)) == python
+        True
+    """
+    np = import_numpy()
+    heights = np.frombuffer(grid.cells, dtype=np.int8).reshape(grid.height, grid.width)
+    padded = np.pad(heights, 1, constant_values=10)
+    center = padded[1:-1, 1:-1]
+    low = center < padded[:-2, 1:-1]
+    low &= center < padded[2:, 1:-1]
+    low &= center < padded[1:-1, :-2]
+    low &= center < padded[1:-1, 2:]
+
+    return np.flatnonzero(low).tolist()
 
 
 @dataclass
 class Puzzle(PuzzleTemplate):
-    map: list[list[int]]
-    num_columns: int
-    num_rows: int
+    map: Grid
+    backend: str = "python"
+
+    def __post_init__(self):
+        check_backend(self.backend, BACKENDS)
 
     @classmethod
-    def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
-        map_ = [[int(height) for height in line.strip()] for line in lines]
+    def from_lines(cls, lines: Iterable[str], backend: str = "python") -> "Puzzle":
+        return cls(map=Grid.from_lines(lines), backend=backend)
 
-        return cls(map=map_, num_rows=len(map_), num_columns=len(map_[0]))
+    @classmethod
+    def solve_stream(cls, lines: Iterable[str]) -> tuple[int, int]:
+        """
+        Solves both tasks in a single pass, keeping only three rows of heights and the labels of
+        the previous row. Low points of a row are known once the row below has been read. Basins
+        are labeled row by row like in `basin_labels`, cells are counted per label and the counts
+        of united labels are added up at the end.
+
+            >>> lines = ["2199943210", "3987894921", "9856789892", "8767896789", "9899965678"]
+            >>> Puzzle.solve_stream(lines)
+            (15, 1134)
+        """
+        risk = 0
+        parents: list[int] = []
+        counts = Counter()
+        above = row = labels = None
+        for line in lines:
+            below = line.strip().encode().translate(DIGITS)
+            labels = label_row(below, labels, parents)
+            counts.update(labels)
+            if row is not None:
+                risk += low_point_risk(above, row, below)
+            above, row = row, below
+        risk += low_point_risk(above, row, None)
+
+        del counts[WALL]
+        sizes = Counter()
+        for label, count in counts.items():
+            sizes[find(parents, label)] += count
+
+        return risk, reduce(operator.mul, heapq.nlargest(3, sizes.values()))
+
+    def all_neighbors_higher(self, index: int) -> bool:
+        heights = self.map.cells
+        height = heights[index]
+        for neighbor in self.map.neighbors(index):
+            if heights[neighbor] <= height:
+                return False
 
-    def is_valid(self, row: int, col: int) -> bool:
-        return 0 <= row < self.num_rows and 0 <= col < self.num_columns
+        return True
 
-    def all_neighbors(self, row: int, col: int) -> Iterable[Point]:
-        for d_row, d_col in ((-1, 0), (0, -1), (1, 0), (0, 1)):
-            new_row, new_col = row + d_row, col + d_col
-            if self.is_valid(row=new_row, col=new_col):
-                yield Point(new_row, new_col)
+    def mark_points(self, points: Iterable[int]):
+        show(lambda: f"\n{self.map.format(cells=points)}\n")
 
-    def all_neighbors_higher(self, row: int, col: int) -> bool:
-        height = self.map[row][col]
-        for n_row, n_col in self.all_neighbors(row, col):
-            if self.map[n_row][n_col] <= height:
-                return False
+    def low_points(self) -> Iterable[int]:
+        if self.backend == "numpy":
+            return numpy_low_points(self.map)
 
-        return True
+        return (index for index in range(len(self.map)) if self.all_neighbors_higher(index))
+
+    def basin_labels(self) -> array:
+        """
+        Labels connected components of cells lower than 9 in a single scan. A cell takes the label
+        of its left or upper neighbor, where the two differ union-find records that the labels
+        belong to the same basin. Walls are labeled -1.
+
+            >>> lines = ["2199943210", "3987894921", "9856789892", "8767896789", "9899965678"]
+            >>> labels = Puzzle.from_lines(lines).basin_labels()
+            >>> sorted(Counter(label for label in labels if label != WALL).values())
+            [3, 9, 9, 14]
+        """
+        labels = array("q")
+        parents: list[int] = []
+        row_labels = None
+        for row in self.map.rows():
+            row_labels = label_row(row, row_labels, parents)
+            labels.extend(row_labels)
 
-    def mark_points(self, points: Iterable[Point]):
-        points_ = set(points)
-
-        print()
-        for row in range(self.num_rows):
-            print(
-                "".join(
-                    str(self.map[row][col]) if Point(row, col) in points_ else "."
-                    for col in range(self.num_columns)
-                )
-            )
-        print()
-
-    def low_points(self) -> Iterable[Point]:
-        for row in range(self.num_rows):
-            for col in range(self.num_columns):
-                if self.all_neighbors_higher(row, col):
-                    yield Point(row=row, col=col)
-
-    def find_basin(self, row: int, col: int) -> Iterable[Point]:
-        open_list = {Point(row, col)}
-        closed_list = set()
-
-        while open_list:
-            point = open_list.pop()
-            closed_list.add(point)
-            yield point
-
-            height = self.map[point.row][point.col]
-            for neighbor in self.all_neighbors(point.row, point.col):
-                if (
-                    neighbor not in open_list
-                    and neighbor not in closed_list
-                    and height < self.map[neighbor.row][neighbor.col] < 9
-                ):
-                    open_list.add(neighbor)
+        roots = [find(parents, label) for label in range(len(parents))]
+        for index, label in enumerate(labels):
+            if label != WALL:
+                labels[index] = roots[label]
+
+        return labels
+
+    def largest_basins(self, count: int = 3) -> int:
+        labels = self.basin_labels()
+        sizes = Counter(labels)
+        del sizes[WALL]
+
+        # picks the largest few without sorting all basins
+        largest = heapq.nlargest(count, sizes.items(), key=itemgetter(1))
+        largest_labels = {label for label, _ in largest}
+        self.mark_points(index for index, label in enumerate(labels) if label in largest_labels)
+
+        return reduce(operator.mul, (size for _, size in largest))
 
     def task_one(self) -> int:
         low_points = list(self.low_points())
         self.mark_points(low_points)
-        return sum(self.map[row][col] + 1 for row, col in low_points)
+        return sum(self.map.cells[index] + 1 for index in low_points)
 
     def task_two(self) -> int:
-        low_points = list(self.low_points())
-        basins = [list(self.find_basin(row, col)) for row, col in low_points]
-
-        self.mark_points(chain(*basins))
-
-        sizes = sorted([len(basin) for basin in basins])
-
-        return reduce(operator.mul, sizes[-3:])
+        return self.largest_basins()
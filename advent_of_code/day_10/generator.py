@@ -0,0 +1,43 @@
+from typing import Iterator
+import random
+
+from advent_of_code.day_10.solution import CLOSING, OPENING, PAIRS
+
+OFFICIAL_LINES = 102
+LINE_LENGTH = 100
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields lines of brackets, roughly half of them corrupted and the rest incomplete. The
+    number of incomplete lines is always odd, so the autocomplete median is well defined.
+
+        >>> len(list(generate(scale=10)))
+        1020
+    """
+    rng = random.Random(seed)
+    lines = max(1, round(OFFICIAL_LINES * scale))
+    corrupted = [rng.random() < 0.5 for _ in range(lines)]
+    if corrupted.count(False) % 2 == 0:
+        corrupted[0] = not corrupted[0]
+
+    for is_corrupted in corrupted:
+        stack = []
+        chars = []
+        while len(chars) < LINE_LENGTH or not stack:
+            if stack and rng.random() < 0.45:
+                chars.append(PAIRS[stack.pop()])
+            else:
+                stack.append(rng.choice(OPENING))
+                chars.append(stack[-1])
+
+        if is_corrupted:
+            # replace some closing bracket by a wrong one
+            closing = [i for i, char in enumerate(chars) if char in CLOSING]
+            if closing:
+                i = rng.choice(closing)
+                chars[i] = rng.choice([char for char in CLOSING if char != chars[i]])
+            else:
+                chars.append(rng.choice([char for char in CLOSING if char != PAIRS[stack[-1]]]))
+
+        yield "".join(chars) + "\n"
@@ -1,7 +1,8 @@
 from typing import Iterable
 from dataclasses import dataclass
 from itertools import chain
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.display import show, verbose
+from advent_of_code.puzzle import PuzzleTemplate
 from statistics import median
 
 CORRUPTED_SCORE_BOARD = {")": 3, "]": 57, "}": 1197, ">": 25137}
@@ -26,10 +27,10 @@ class Puzzle(PuzzleTemplate):
     def check_line(line: str) -> CheckerOutput:
         """
         >>> Puzzle.check_line('{([(<{}[<>[]}>{[]{[(<()>').syntax_error
-        Expected ], but found } instead.
         1197
 
-        >>> Puzzle.check_line('[{[{({}]{}}([{[{{{}}([]').syntax_error
+        >>> with verbose():
+        ...     Puzzle.check_line('[{[{({}]{}}([{[{{{}}([]').syntax_error
         Expected ), but found ] instead.
         57
         """
@@ -40,7 +41,7 @@ class Puzzle(PuzzleTemplate):
             elif char in CLOSING:
                 opening = stack.pop()
                 if PAIRS[opening] != char:
-                    print(f"Expected {PAIRS[opening]}, but found {char} instead.")
+                    show(lambda: f"Expected {PAIRS[opening]}, but found {char} instead.")
                     return CheckerOutput(syntax_error=CORRUPTED_SCORE_BOARD[char])
             else:
                 raise ValueError(f"Invalid input {char}")
@@ -77,6 +78,23 @@ class Puzzle(PuzzleTemplate):
     def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
         return cls(lines=[line.strip() for line in lines])
 
+    @classmethod
+    def solve_stream(cls, lines: Iterable[str]) -> tuple[int, int]:
+        """
+        Solves both tasks in a single pass, checking every line once. Only autocomplete scores
+        are kept, the median needs all of them.
+        """
+        syntax_error = 0
+        autocomplete_scores = []
+
+        for line in lines:
+            output = cls.check_line(line.strip())
+            syntax_error += output.syntax_error
+            if output.missing_chars:  # ignore syntax errors, they would mess up median
+                autocomplete_scores.append(cls.autocomplete_score(output.missing_chars))
+
+        return syntax_error, median(autocomplete_scores)
+
     def task_one(self) -> int:
         return sum(self.check_line(line).syntax_error for line in self.lines)
 
@@ -87,3 +105,7 @@ class Puzzle(PuzzleTemplate):
             for output in checker_output
             if output.missing_chars  # ignore syntax errors, they would mess up median
         )
+
+    def solve_both(self) -> tuple[int, int]:
+        # both tasks need the checker output of every line, check each of them only once
+        return self.solve_stream(self.lines)
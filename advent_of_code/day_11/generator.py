@@ -0,0 +1,88 @@
+from typing import Iterator, Optional
+import random
+
+OFFICIAL_SIDE = 10
+# the official grid synchronizes in a few hundred steps
+MAX_SYNCHRONIZATION_STEPS = 1000
+
+
+def tile(pattern: list[list[int]], times: int) -> list[list[int]]:
+    """
+    >>> tile([[1, 2], [3, 4]], 2)
+    [[1, 2, 1, 2], [3, 4, 3, 4], [1, 2, 1, 2], [3, 4, 3, 4]]
+    """
+    return [row * times for row in pattern] * times
+
+
+def synchronization_step(grid: list[list[int]], max_steps: int) -> Optional[int]:
+    """
+    Returns the first step in which all octopuses flash, or None if it doesn't happen in
+    `max_steps`. A compact reimplementation of `Puzzle.step`, the generator runs it a lot.
+
+        >>> synchronization_step([[9, 9], [9, 8]], max_steps=10)
+        1
+        >>> synchronization_step([[0, 5]], max_steps=10)
+    """
+    height, width = len(grid), len(grid[0])
+    energy = [level for row in grid for level in row]
+    neighbors = [
+        [
+            (r + dr) * width + c + dc
+            for dr in (-1, 0, 1)
+            for dc in (-1, 0, 1)
+            if (dr or dc) and 0 <= r + dr < height and 0 <= c + dc < width
+        ]
+        for r in range(height)
+        for c in range(width)
+    ]
+
+    for step in range(1, max_steps + 1):
+        energy = [level + 1 for level in energy]
+        will_flash = [i for i, level in enumerate(energy) if level == 10]
+        flashed = 0
+        while will_flash:
+            flashed += 1
+            for neighbor in neighbors[will_flash.pop()]:
+                energy[neighbor] += 1
+                if energy[neighbor] == 10:
+                    will_flash.append(neighbor)
+
+        if flashed == len(energy):
+            return step
+        energy = [0 if level > 9 else level for level in energy]
+
+    return None
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields rows of a square grid of octopus energy levels with the area about `scale` times
+    the official one.
+
+    Random grids mostly end up cycling without ever synchronizing, so the grid is tiled from
+    an official sized pattern and the emitted tiling is checked to synchronize. Checking large
+    tilings is slow, so patterns whose 3x3 and 4x4 tilings don't synchronize in the same step
+    are rejected first, bigger tilings of the others almost always synchronize.
+
+        >>> lines = [list(generate(scale=scale, seed=seed)) for scale in (1, 2) for seed in range(5)]
+        >>> all(synchronization_step([list(map(int, line.strip())) for line in grid], 1000)
+        ...     for grid in lines)
+        True
+    """
+    rng = random.Random(seed)
+    times = max(1, round(scale**0.5))
+    # tilings to check from the cheapest to the emitted one
+    checked = sorted({3, 4, times}) if times > 4 else [times]
+
+    while True:
+        pattern = [[rng.randrange(10) for _ in range(OFFICIAL_SIDE)] for _ in range(OFFICIAL_SIDE)]
+        steps = set()
+        for size in checked:
+            steps.add(synchronization_step(tile(pattern, size), MAX_SYNCHRONIZATION_STEPS))
+            if None in steps or len(steps) > 1:
+                break
+        else:
+            break
+
+    for row in tile(pattern, times):
+        yield "".join(map(str, row)) + "\n"
@@ -1,80 +1,213 @@
-from typing import Iterable, NamedTuple
+from typing import Any, Callable, Iterable, NamedTuple
+from array import array
 from dataclasses import dataclass
+from functools import cached_property, partial
+from itertools import count
 
-from advent_of_code.runner import PuzzleTemplate
-from copy import deepcopy
-from itertools import count, product
+from advent_of_code.display import show
+from advent_of_code.grid import EIGHT_CONNECTED, NO_NEIGHBOR, Grid, neighbor_table
+from advent_of_code.puzzle import PuzzleTemplate
+from advent_of_code.utils import check_backend, import_numpy, numpy_available
+
+BACKENDS = ("python", "numpy")
 
 
 class Step(NamedTuple):
-    grid: list[list[int]]
+    grid: Grid
     flashed: int
 
 
+def state_view(state: Grid) -> memoryview:
+    """
+    Energy levels as bytes without copying them, works for cells of both backends.
+
+        >>> state_view(Grid.from_lines(["05"])).tolist()
+        [0, 5]
+    """
+    return memoryview(state.cells).cast("B")
+
+
+def numpy_neighbor_table(width: int, height: int) -> Any:
+    """
+    Eight neighbors of every cell as rows of an array. Missing neighbors on the border point to
+    an extra cell past the end of the grid.
+    """
+    np = import_numpy()
+    size = width * height
+    rows, cols = np.divmod(np.arange(size), width)
+    table = np.full((size, len(EIGHT_CONNECTED)), size)
+    for column, (d_row, d_col) in enumerate(EIGHT_CONNECTED):
+        new_rows, new_cols = rows + d_row, cols + d_col
+        valid = (0 <= new_rows) & (new_rows < height) & (0 <= new_cols) & (new_cols < width)
+        table[valid, column] = (new_rows * width + new_cols)[valid]
+
+    return table
+
+
+def numpy_step(state: Grid, table: Any) -> Step:
+    """
+    Same as `Puzzle.step` with whole-array operations, cells of the state are a NumPy array and
+    `table` is its `numpy_neighbor_table`.
+
+    Every round of the cascade adds the 3x3 convolution of the new flashes to the energy. While
+    many octopuses flash, the separable kernel is summed over shifted copies of the whole grid.
+    Cascades tend to end with tens of rounds of just a few flashes, those are scattered to their
+    neighbors one by one instead.
+
+        >>> from advent_of_code.day_11.generator import generate
+        >>> lines = list(generate(scale=1, seed=1))
+        >>> python = Puzzle.from_lines(lines)
+        >>> numpy = Puzzle.from_lines(lines, backend="numpy")
+        >>> not numpy_available() or numpy.task_one() == python.task_one()
+        True
+        >>> not numpy_available() or numpy.task_two() == python.task_two()
+        True
+    """
+    np = import_numpy()
+    height, width = state.height, state.width
+    size = height * width
+
+    energy = state.cells.reshape(height, width) + 1
+    flashed = np.zeros((height, width), dtype=bool)
+    # new flashes surrounded by a border of zeros, so shifted slices stay in bounds
+    padded = np.zeros((height + 2, width + 2), dtype=np.int8)
+
+    new_flashes = energy > 9
+    while new_flashes.sum() > size // 32:
+        flashed |= new_flashes
+        padded[1:-1, 1:-1] = new_flashes
+        # the kernel includes the cell itself, it has already flashed so that is harmless
+        rows = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+        energy += rows[:-2] + rows[1:-1] + rows[2:]
+
+        new_flashes = energy > 9
+        new_flashes &= ~flashed
+
+    # the extra cell collects increments from the border, it counts as flashed so it never does
+    energy = np.append(energy, 0)
+    flashed = np.append(flashed, True)
+
+    new_flashes = np.flatnonzero(new_flashes)
+    while len(new_flashes):
+        flashed[new_flashes] = True
+        neighbors, increments = np.unique(table[new_flashes], return_counts=True)
+        energy[neighbors] += increments.astype(np.int8)
+        new_flashes = neighbors[(energy[neighbors] > 9) & ~flashed[neighbors]]
+
+    energy[flashed] = 0
+    grid = Grid(cells=energy[:size], width=width, height=height)
+    return Step(grid=grid, flashed=int(flashed.sum()) - 1)
+
+
 @dataclass
 class Puzzle(PuzzleTemplate):
-    grid: list[list[int]]
-    width: int
-    height: int
-
-    def step(self, state: list[list[int]]) -> Step:
-        grid = deepcopy(state)
-        will_flash = set()
-        flashed = set()
+    grid: Grid
+    backend: str = "python"
+
+    def __post_init__(self):
+        check_backend(self.backend, BACKENDS)
+
+    @property
+    def width(self) -> int:
+        return self.grid.width
+
+    @property
+    def height(self) -> int:
+        return self.grid.height
+
+    @cached_property
+    def neighbor_table(self) -> array:
+        return neighbor_table(self.grid.eight_connected())
+
+    def step(self, state: Grid) -> Step:
+        """
+        Advances the state in place. An octopus flashes exactly when its energy goes from 9 to
+        10, so nothing has to remember which ones already flashed during the step.
+        """
+        energy = state.cells
+        table, stride = self.neighbor_table, len(EIGHT_CONNECTED)
+        will_flash = []
+        flashed = 0
 
         # increase all energy levels by 1, memorize all that will flash
-        for h in range(self.height):
-            for w in range(self.width):
-                grid[h][w] += 1
-                if grid[h][w] > 9:
-                    will_flash.add((h, w))
+        for index in range(len(energy)):
+            energy[index] += 1
+            if energy[index] == 10:
+                will_flash.append(index)
 
         while will_flash:
-            h, w = will_flash.pop()
-            flashed.add((h, w))
-            for dh, dw in product([-1, 0, 1], repeat=2):
-                neighbout_point = h + dh, w + dw
-                if self.valid(neighbout_point):
-                    # this also has the point itself, but it's in flashed so it won't trigger again
-                    nh, nw = neighbout_point
-                    grid[nh][nw] += 1
-                    if grid[nh][nw] > 9 and neighbout_point not in flashed:
-                        will_flash.add(neighbout_point)
+            index = will_flash.pop()
+            flashed += 1
+            for neighbor in table[index * stride : (index + 1) * stride]:
+                if neighbor == NO_NEIGHBOR:
+                    break
+                energy[neighbor] += 1
+                if energy[neighbor] == 10:
+                    will_flash.append(neighbor)
 
         # set all that flashed back to energy level 0
-        for h, w in flashed:
-            grid[h][w] = 0
+        for index in range(len(energy)):
+            if energy[index] > 9:
+                energy[index] = 0
 
-        return Step(grid=grid, flashed=len(flashed))
-
-    def valid(self, point: tuple[int, int]) -> bool:
-        h, w = point
-        return 0 <= h < self.height and 0 <= w < self.width
+        return Step(grid=state, flashed=flashed)
 
     @classmethod
-    def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
-        grid = [[int(char) for char in line.strip()] for line in lines]
-
-        return cls(grid=grid, height=len(grid), width=len(grid[0]))
+    def from_lines(cls, lines: Iterable[str], backend: str = "python") -> "Puzzle":
+        return cls(grid=Grid.from_lines(lines), backend=backend)
+
+    def initial_state(self) -> tuple[Grid, Callable[[Grid], Step]]:
+        """
+        Returns the starting grid in the representation of the backend and its step function.
+        """
+        if self.backend == "numpy":
+            np = import_numpy()
+            cells = np.frombuffer(self.grid.cells, dtype=np.int8).copy()
+            table = numpy_neighbor_table(self.width, self.height)
+            grid = Grid(cells=cells, width=self.width, height=self.height)
+            return grid, partial(numpy_step, table=table)
+
+        # steps modify the state, the puzzle itself must stay untouched
+        return self.grid.copy(), self.step
 
     def task_one(self) -> int:
-        grid = self.grid
+        grid, step = self.initial_state()
         total_flashes = 0
         for i in range(1, 101):
-            grid, flashed = self.step(grid)
+            grid, flashed = step(grid)
             total_flashes += flashed
 
             if i % 10 == 0:
-                print(f"After step {i}:")
-                for row in grid:
-                    print("".join(map(str, row)))
-                print()
+                show(lambda: f"After step {i}:\n{grid.format()}\n")
 
         return total_flashes
 
     def task_two(self) -> int:
-        grid = self.grid
-        for i in range(10_000_000):
-            grid, flashed = self.step(grid)
+        """
+        Steps until all octopuses flash at once. There are finitely many states, so if they never
+        synchronize the states start repeating, which ends the search with an error.
+
+            >>> Puzzle.from_lines(["05"]).task_two()
+            Traceback (most recent call last):
+            ...
+            ValueError: Octopuses never flash all at once, their states repeat every 9 steps.
+        """
+        grid, step = self.initial_state()
+
+        # Brent's cycle detection, states are compared with a snapshot retaken after every power
+        # of two steps, which finds the cycle without remembering all states
+        snapshot, power, since_snapshot = state_view(grid).tobytes(), 1, 0
+        for i in count(1):
+            grid, flashed = step(grid)
             if flashed == self.width * self.height:  # detect all flashed at the same time
-                return i + 1  # they expect us to start counting from 1 not 0
+                return i
+
+            since_snapshot += 1
+            if state_view(grid) == snapshot:
+                raise ValueError(
+                    "Octopuses never flash all at once, their states repeat every "
+                    f"{since_snapshot} steps."
+                )
+
+            if since_snapshot == power:
+                snapshot, power, since_snapshot = state_view(grid).tobytes(), power * 2, 0
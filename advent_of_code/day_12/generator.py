@@ -0,0 +1,48 @@
+from typing import Iterator
+import random
+from string import ascii_lowercase
+
+OFFICIAL_BRANCHES = 4
+
+
+def cave_name(number: int) -> str:
+    """
+    Converts a number to a unique lowercase name.
+
+        >>> [cave_name(n) for n in (0, 25, 26, 27)]
+        ['a', 'z', 'aa', 'ab']
+    """
+    name = ""
+    number += 1
+    while number:
+        number, remainder = divmod(number - 1, len(ascii_lowercase))
+        name = ascii_lowercase[remainder] + name
+
+    return name
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields edges of a cave system made of independent branches between `start` and `end`.
+    Branches only meet in `start` and `end`, so the number of paths grows linearly with the
+    scale instead of exploding. Big caves are never connected to each other, otherwise there
+    would be infinitely many paths.
+    """
+    rng = random.Random(seed)
+    names = (name for name in map(cave_name, range(2**32)) if name not in ("start", "end"))
+
+    for _ in range(max(1, round(OFFICIAL_BRANCHES * scale))):
+        entry, exit_, dead_end = next(names), next(names), next(names)
+        big = next(names).upper()
+
+        edges = [
+            ("start", entry),
+            (entry, big),
+            (big, exit_),
+            (exit_, "end"),
+            (entry, exit_),
+            (big, dead_end),
+        ]
+        rng.shuffle(edges)
+        for a, b in edges:
+            yield f"{a}-{b}\n" if rng.random() < 0.5 or "start" in (a, b) else f"{b}-{a}\n"
@@ -2,7 +2,7 @@ from collections import Counter, defaultdict
 from typing import Iterable
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
 
 
 @dataclass
@@ -0,0 +1,64 @@
+from typing import Iterator
+import random
+
+OFFICIAL_DOTS = 880
+OFFICIAL_WIDTH = 1311
+OFFICIAL_HEIGHT = 895
+# size of the paper after all folds, the letters are drawn on it
+FOLDED_WIDTH = 40
+FOLDED_HEIGHT = 6
+
+
+def fold_lines(folded: int, target: int) -> list[int]:
+    """
+    Returns fold lines (largest first) for paper at least `target` wide to end up `folded` wide.
+
+        >>> fold_lines(40, 1311)
+        [655, 327, 163, 81, 40]
+    """
+    lines = []
+    while folded < target:
+        lines.append(folded)
+        folded = 2 * folded + 1
+
+    return list(reversed(lines))
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields dots on a paper with the area `scale` times the official one followed by folds,
+    alternating axes like the official input. No dot ever lies on a fold line.
+    """
+    rng = random.Random(seed)
+    x_folds = fold_lines(FOLDED_WIDTH, OFFICIAL_WIDTH * scale**0.5)
+    y_folds = fold_lines(FOLDED_HEIGHT, OFFICIAL_HEIGHT * scale**0.5)
+
+    folds = [("x", value) for value in x_folds] + [("y", value) for value in y_folds]
+    folds.sort(key=lambda fold: -fold[1] / (x_folds if fold[0] == "x" else y_folds)[0])
+    width = 2 * x_folds[0] + 1 if x_folds else FOLDED_WIDTH
+    height = 2 * y_folds[0] + 1 if y_folds else FOLDED_HEIGHT
+
+    def on_fold_line(x: int, y: int) -> bool:
+        for axis, value in folds:
+            coordinate = x if axis == "x" else y
+            if coordinate == value:
+                return True
+            if coordinate > value:
+                coordinate = 2 * value - coordinate
+            x, y = (coordinate, y) if axis == "x" else (x, coordinate)
+        return False
+
+    dots = set()
+    target = min(max(1, round(OFFICIAL_DOTS * scale)), width * height // 2)
+    while len(dots) < target:
+        dot = rng.randrange(width), rng.randrange(height)
+        if not on_fold_line(*dot):
+            dots.add(dot)
+
+    for x, y in dots:
+        yield f"{x},{y}\n"
+
+    yield "\n"
+
+    for axis, value in folds:
+        yield f"fold along {axis}={value}\n"
@@ -1,18 +1,31 @@
-from typing import Iterable, NamedTuple
+from typing import Any, Collection, Iterable
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
-from operator import attrgetter
+from advent_of_code.puzzle import PuzzleTemplate
+from advent_of_code.utils import check_backend, import_numpy, numpy_available
 
+BACKENDS = ("python", "numpy")
+# dots are single ints with x (left to right) in the high bits and y (top to bottom) in the low
+# ones, folds then are integer arithmetic on them
+Y_BITS = 32
+Y_MASK = (1 << Y_BITS) - 1
 
-class Dot(NamedTuple):
-    x: int  # left to right
-    y: int  # top to bottom
 
-    @classmethod
-    def from_line(cls, line: str) -> "Dot":
-        x, y = map(int, line.split(","))
-        return cls(x=x, y=y)
+def pack(x: int, y: int) -> int:
+    """
+    >>> unpack(pack(957, 648))
+    (957, 648)
+    """
+    return x << Y_BITS | y
+
+
+def unpack(dot: int) -> tuple[int, int]:
+    return dot >> Y_BITS, dot & Y_MASK
+
+
+def parse_dot(line: str) -> int:
+    x, y = map(int, line.split(","))
+    return pack(x, y)
 
 
 @dataclass
@@ -35,65 +48,96 @@ class Fold:
         return cls(axis=axis, value=int(value))
 
 
+def numpy_fold(dots: Any, fold: Fold) -> Any:
+    """
+    Same as `Puzzle.fold` for a NumPy array of dots, duplicates are kept.
+
+        >>> from advent_of_code.day_13.generator import generate
+        >>> lines = list(generate(scale=0.1, seed=1))
+        >>> python = Puzzle.from_lines(lines)
+        >>> numpy = Puzzle.from_lines(lines, backend="numpy")
+        >>> not numpy_available() or numpy.folded(numpy.folds) == sorted(python.folded(python.folds))
+        True
+    """
+    np = import_numpy()
+    if fold.axis == "y":
+        y = dots & Y_MASK
+        return np.where(y > fold.value, dots - 2 * (y - fold.value), dots)
+
+    x = dots >> Y_BITS
+    return np.where(x > fold.value, dots - ((2 * (x - fold.value)) << Y_BITS), dots)
+
+
 @dataclass
 class Puzzle(PuzzleTemplate):
-    dots: set[Dot]
+    dots: set[int]
     folds: list[Fold]
+    backend: str = "python"
+
+    def __post_init__(self):
+        check_backend(self.backend, BACKENDS)
 
     @classmethod
-    def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
+    def from_lines(cls, lines: Iterable[str], backend: str = "python") -> "Puzzle":
         dots = set()
         it = iter(lines)
         while (line := next(it).strip()) and line:
-            dots.add(Dot.from_line(line))
+            dots.add(parse_dot(line))
 
         folds = [Fold.from_line(line.strip()) for line in it]
 
-        return cls(dots=dots, folds=folds)
+        return cls(dots=dots, folds=folds, backend=backend)
 
     @staticmethod
-    def fold(dots: set[Dot], fold: Fold) -> set[Dot]:
-        # set get's rid of any duplicate dots (that overlap after a fold)
-        new_dots = set()
-
-        for dot in dots:
-            new_dot = dot
-
-            if fold.axis == "y" and dot.y > fold.value:
-                new_y = fold.value - (dot.y - fold.value)
-                new_dot = dot._replace(y=new_y)
-
-            elif fold.axis == "x" and dot.x > fold.value:
-                new_x = fold.value - (dot.x - fold.value)
-                new_dot = dot._replace(x=new_x)
+    def fold(dots: Iterable[int], fold: Fold) -> set[int]:
+        """
+        Mirrors the dots past the fold line, reflecting a coordinate `c` subtracts
+        `2 * (c - value)` from it. The set gets rid of dots that end up on top of each other.
+
+            >>> dots = {pack(1, 5), pack(1, 1), pack(3, 0), pack(5, 2)}
+            >>> sorted(unpack(dot) for dot in Puzzle.fold(dots, Fold("y", 3)))
+            [(1, 1), (3, 0), (5, 2)]
+            >>> sorted(unpack(dot) for dot in Puzzle.fold(dots, Fold("x", 3)))
+            [(1, 1), (1, 2), (1, 5), (3, 0)]
+        """
+        value = fold.value
+        if fold.axis == "y":
+            return {dot - 2 * (y - value) if (y := dot & Y_MASK) > value else dot for dot in dots}
+
+        # dots right of the fold line are exactly those larger than the last dot on it
+        last = pack(value, Y_MASK)
+        return {
+            dot - ((2 * ((dot >> Y_BITS) - value)) << Y_BITS) if dot > last else dot for dot in dots
+        }
+
+    def folded(self, folds: list[Fold]) -> Collection[int]:
+        if self.backend == "numpy":
+            np = import_numpy()
+            dots = np.fromiter(self.dots, dtype=np.int64, count=len(self.dots))
+            for fold in folds:
+                dots = numpy_fold(dots, fold)
+            return np.unique(dots).tolist()
 
-            new_dots.add(new_dot)
+        dots = self.dots
+        for fold in folds:
+            dots = self.fold(dots, fold)
 
-        return new_dots
+        return dots
 
     @staticmethod
-    def show(dots: list[Dot]) -> str:
-        width = max(dots, key=lambda dot: dot.x).x + 1
-        height = max(dots, key=lambda dot: dot.y).y + 1
-
-        lines = []
+    def show(dots: Iterable[int]) -> str:
+        positions = [unpack(dot) for dot in dots]
+        width = max(x for x, _ in positions) + 1
+        height = max(y for _, y in positions) + 1
 
-        for row in range(height):
-            line = ["."] * width
-            for col in range(width):
-                if Dot(col, row) in dots:
-                    line[col] = "#"
-            lines.append("".join(line))
+        lines = [["."] * width for _ in range(height)]
+        for x, y in positions:
+            lines[y][x] = "#"
 
-        return "\n".join(lines)
+        return "\n".join("".join(line) for line in lines)
 
     def task_one(self) -> int:
-        dots = self.fold(self.dots, self.folds[0])
-        return len(dots)
+        return len(self.folded(self.folds[:1]))
 
     def task_two(self) -> str:
-        dots = self.dots
-        for fold in self.folds:
-            dots = self.fold(dots, fold)
-
-        return self.show(dots)
+        return self.show(self.folded(self.folds))
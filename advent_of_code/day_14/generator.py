@@ -0,0 +1,29 @@
+from typing import Iterator, Optional
+import random
+from string import ascii_uppercase
+
+OFFICIAL_TEMPLATE_LENGTH = 20
+OFFICIAL_LETTERS = 10
+
+
+def generate(scale: float = 1, seed: int = 0, letters: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields a polymer template `scale` times longer than the official one and an insertion rule
+    for every pair of letters. The alphabet has `letters` letters, by default it grows with
+    the scale up to all 26.
+
+        >>> list(generate(scale=0.1, seed=1, letters=2))
+        ['AA\\n', '\\n', 'AA -> B\\n', 'AB -> A\\n', 'BA -> B\\n', 'BB -> B\\n']
+    """
+    rng = random.Random(seed)
+    if letters is None:
+        letters = min(len(ascii_uppercase), round(OFFICIAL_LETTERS * max(1, scale) ** 0.5))
+    alphabet = ascii_uppercase[:letters]
+
+    length = max(2, round(OFFICIAL_TEMPLATE_LENGTH * scale))
+    yield "".join(rng.choice(alphabet) for _ in range(length)) + "\n"
+    yield "\n"
+
+    for first in alphabet:
+        for second in alphabet:
+            yield f"{first}{second} -> {rng.choice(alphabet)}\n"
@@ -1,15 +1,105 @@
-from typing import Iterable
+from typing import Iterable, Optional
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.matrix import Matrix, Vector, transform_many
+from advent_of_code.puzzle import PuzzleTemplate
 from collections import Counter
 
 
+def insert(pair: str, element: str) -> tuple[str, str]:
+    """
+    >>> insert("AB", "C")
+    ('AC', 'CB')
+    """
+    return f"{pair[0]}{element}", f"{element}{pair[-1]}"
+
+
+@dataclass(frozen=True)
+class PairTable:
+    """
+    Insertion rules compiled to integers. Pairs are numbered in sorted order, pair counts are
+    lists indexed by these numbers. Every pair knows the numbers of the two pairs it turns into
+    and of its first letter, so steps and scores need no strings.
+
+        >>> table = PairTable.compile({"AA": "B", "AB": "A", "BA": "B", "BB": "A"})
+        >>> table.pairs, table.lefts, table.rights
+        (['AA', 'AB', 'BA', 'BB'], [1, 0, 3, 2], [2, 1, 2, 1])
+        >>> table.step([0, 1, 0, 0])  # AB -> AAB
+        [1, 1, 0, 0]
+    """
+
+    pairs: list[str]
+    lefts: list[int]
+    rights: list[int]
+    letters: str
+    first_letters: list[int]
+
+    @classmethod
+    def compile(cls, rules: dict[str, str]) -> "PairTable":
+        pairs = sorted(rules)
+        index = {pair: i for i, pair in enumerate(pairs)}
+        letters = "".join(sorted(set("".join(pairs))))
+
+        lefts, rights = [], []
+        for pair in pairs:
+            for child, children in zip(insert(pair, rules[pair]), (lefts, rights)):
+                if child not in index:
+                    raise ValueError(f"No insertion rule for the pair {child}.")
+                children.append(index[child])
+
+        first_letters = [letters.index(pair[0]) for pair in pairs]
+        return cls(pairs, lefts, rights, letters, first_letters)
+
+    def counts(self, pairs: Counter[str]) -> Vector:
+        unknown = pairs.keys() - set(self.pairs)
+        if unknown:
+            raise ValueError(f"No insertion rule for the pairs {sorted(unknown)}.")
+
+        return [pairs[pair] for pair in self.pairs]
+
+    def step(self, counts: Vector, modulus: Optional[int] = None) -> Vector:
+        new_counts = [0] * len(counts)
+        for left, right, count in zip(self.lefts, self.rights, counts):
+            if count:
+                new_counts[left] += count
+                new_counts[right] += count
+
+        if modulus is not None:
+            new_counts = [count % modulus for count in new_counts]
+
+        return new_counts
+
+    def transition_matrix(self) -> Matrix:
+        """
+        One step as a linear map of the pair counts, entry `[child][pair]` is how many times
+        inserting into the pair creates the child.
+
+            >>> PairTable.compile({"AA": "B", "AB": "A", "BA": "B", "BB": "A"}).transition_matrix()
+            [[0, 1, 0, 0], [1, 1, 0, 1], [1, 0, 1, 1], [0, 0, 1, 0]]
+        """
+        matrix = [[0] * len(self.pairs) for _ in self.pairs]
+        for pair, (left, right) in enumerate(zip(self.lefts, self.rights)):
+            matrix[left][pair] += 1
+            matrix[right][pair] += 1
+
+        return matrix
+
+    def letter_counts(self, counts: Vector, last: str) -> list[int]:
+        letter_counts = [0] * len(self.letters)
+        for letter, count in zip(self.first_letters, counts):
+            letter_counts[letter] += count
+        # only the last element is not the first of any pair
+        letter_counts[self.letters.index(last)] += 1
+
+        return letter_counts
+
+
 @dataclass
 class Puzzle(PuzzleTemplate):
     ends: tuple[str, str]
     template: Counter[str]
     rules: dict[str, str]
+    table: PairTable
 
     @classmethod
     def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
@@ -24,40 +114,70 @@ class Puzzle(PuzzleTemplate):
         pairs = (line.strip().split(" -> ") for line in it)
         rules = {from_: to for from_, to in pairs}
 
-        return cls(ends=ends, template=template, rules=rules)
+        return cls(ends=ends, template=template, rules=rules, table=PairTable.compile(rules))
+
+    def initial_counts(self) -> Vector:
+        return self.table.counts(self.template)
+
+    def score(self, counts: Vector) -> int:
+        occurrences = [count for count in self.table.letter_counts(counts, self.ends[1]) if count]
+        return max(occurrences) - min(occurrences)
+
+    def pair_counts_many(self, steps: Iterable[int], modulus: Optional[int] = None) -> list[Vector]:
+        """
+        Pair counts after each of the given numbers of steps, in the order of `table.pairs`.
 
-    def apply_rule(self, elements: str) -> str:
+        Stepping through the sorted queries costs about `max(steps) * pairs` operations, powers
+        of the transition matrix about `pairs**3` per bit of the step counts, but one set of them
+        serves all the queries. Counts double with every step, for millions of steps they are
+        only practical modulo `modulus`.
         """
-        >>> puzzle = Puzzle.from_lines(["ABA", "", "AB -> C"])
-        >>> puzzle.apply_rule("AB")
-        ('AC', 'CB')
+        steps = list(steps)
+        counts = self.initial_counts()
+        largest = max(steps, default=0)
+        if largest > len(counts) ** 2 * largest.bit_length():
+            return transform_many(self.table.transition_matrix(), counts, steps, modulus)
+
+        results = {}
+        done = 0
+        for target in sorted(set(steps)):
+            for _ in range(target - done):
+                counts = self.table.step(counts, modulus)
+            results[target], done = counts, target
+
+        return [results[target] for target in steps]
+
+    def scores_many(self, steps: Iterable[int]) -> list[int]:
         """
+        Scores after each of the given numbers of steps, computed with `pair_counts_many`.
 
-        new_element = self.rules[elements]
-        return f"{elements[0]}{new_element}", f"{new_element}{elements[-1]}"
+            >>> rules = ["CH -> B", "HH -> N", "CB -> H", "NH -> C", "HB -> C", "HC -> B"]
+            >>> rules += ["HN -> C", "NN -> C", "BH -> H", "NC -> B", "NB -> B", "BN -> B"]
+            >>> rules += ["BB -> N", "BC -> B", "CC -> N", "CN -> C"]
+            >>> Puzzle.from_lines(["NNCB", ""] + rules).scores_many([40, 10])
+            [2188189693529, 1588]
+        """
+        return [self.score(counts) for counts in self.pair_counts_many(steps)]
 
     def task_one(self, steps: int = 10) -> int:
-        template = self.template
-
+        counts = self.initial_counts()
         for _ in range(steps):
-            new_template = Counter()
-            for element_pair, count in template.items():
-                for new_pairs in self.apply_rule(element_pair):
-                    new_template[new_pairs] += count
-            template = new_template
-
-        letter_counts = Counter()
-        for element_pair, count in template.items():
-            letter_counts[element_pair[0]] += count
-            letter_counts[element_pair[1]] += count
-
-        # we count every element twice (as first in the pair and as the second)
-        # need to do the same for the very first and very last which are counted only once
-        for end in self.ends:
-            letter_counts[end] += 1
+            counts = self.table.step(counts)
 
-        occurrences = letter_counts.most_common()
-        return (occurrences[0][1] - occurrences[-1][1]) // 2
+        return self.score(counts)
 
     def task_two(self) -> int:
         return self.task_one(steps=40)
+
+    def solve_both(self) -> tuple[int, int]:
+        """
+        Task two continues from the polymer of task one instead of starting over.
+
+            >>> rules = ["CH -> B", "HH -> N", "CB -> H", "NH -> C", "HB -> C", "HC -> B"]
+            >>> rules += ["HN -> C", "NN -> C", "BH -> H", "NC -> B", "NB -> B", "BN -> B"]
+            >>> rules += ["BB -> N", "BC -> B", "CC -> N", "CN -> C"]
+            >>> Puzzle.from_lines(["NNCB", ""] + rules).solve_both()
+            (1588, 2188189693529)
+        """
+        one, two = self.scores_many([10, 40])
+        return one, two
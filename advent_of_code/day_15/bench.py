@@ -0,0 +1,87 @@
+from typing import Callable, Optional
+from pathlib import Path
+import time
+
+import click
+
+from advent_of_code.day_15.solution import Puzzle, TiledRisks, heap_search, manhattan_heuristic
+from advent_of_code.grid import FourNeighbors
+from advent_of_code.pathfinding import bucket_search
+from advent_of_code.runner import parse_instance
+from advent_of_code.utils import format_ns, format_table
+
+ENGINES = ("heap A*", "Dial", "Dial + Manhattan")
+
+
+def searches(risks: TiledRisks) -> dict[str, Callable[[], Optional[int]]]:
+    """
+    Every engine searching from the top left to the bottom right corner, returning the cost.
+    """
+    neighbors = FourNeighbors(risks.width, risks.height)
+    goal = len(risks) - 1
+    heuristic = manhattan_heuristic(risks.width, goal)
+
+    return {
+        "heap A*": lambda: heap_search(risks, neighbors, 0, goal, heuristic),
+        "Dial": lambda: bucket_search(risks, neighbors, start=0, goal=goal).cost,
+        "Dial + Manhattan": lambda: bucket_search(
+            risks, neighbors, start=0, goal=goal, heuristic=heuristic
+        ).cost,
+    }
+
+
+def compare_searches(puzzle: Puzzle, tiles: int, repeat: int = 1) -> dict[str, int]:
+    """
+    Fastest time in nanoseconds of every engine on the cave tiled `tiles` times in both
+    directions. The engines have to agree on the cost.
+
+        >>> puzzle = Puzzle.from_lines(["1163", "1381", "2136", "3694"])
+        >>> list(compare_searches(puzzle, tiles=5)) == list(ENGINES)
+        True
+    """
+    risks = TiledRisks(puzzle.grid, repeat_rows=tiles, repeat_cols=tiles)
+    times, costs = {}, set()
+    for name, search in searches(risks).items():
+        samples = []
+        for _ in range(repeat):
+            tic = time.perf_counter_ns()
+            costs.add(search())
+            samples.append(time.perf_counter_ns() - tic)
+        times[name] = min(samples)
+
+    if len(costs) != 1:
+        raise ValueError(f"The searches disagree on the cost: {sorted(costs)}.")
+
+    return times
+
+
+@click.command()
+@click.option(
+    "--size",
+    "sizes",
+    multiple=True,
+    default=("big",),
+    show_default=True,
+    help="Instances to tile: small, big or generated:<scale>[:<seed>]",
+)
+@click.option("--tiles", default="1,5", show_default=True, help="Comma separated tilings")
+@click.option("--repeat", default=3, show_default=True, help="Runs per search, the fastest counts")
+def bench(sizes: tuple[str], tiles: str, repeat: int):
+    """
+    Compares the heap A* that day 15 used to be solved with to Dial's algorithm, with and
+    without the Manhattan heuristic, on tiled caves.
+    """
+    directory = Path(__file__).parent
+    rows = []
+    for size in sizes:
+        puzzle = Puzzle.from_lines(parse_instance(size).read_lines(directory))
+        for tiling in map(int, tiles.split(",")):
+            times = compare_searches(puzzle, tiling, repeat)
+            cells = len(puzzle.grid) * tiling**2
+            rows.append((size, f"{tiling}x", str(cells), *map(format_ns, times.values())))
+
+    print(format_table(("size", "tiles", "cells", *ENGINES), rows))
+
+
+if __name__ == "__main__":
+    bench()
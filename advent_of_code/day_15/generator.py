@@ -0,0 +1,15 @@
+from typing import Iterator
+import random
+
+OFFICIAL_SIDE = 100
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields rows of a square grid of risk levels with the area `scale` times the official one.
+    """
+    rng = random.Random(seed)
+    side = max(2, round(OFFICIAL_SIDE * scale**0.5))
+
+    for _ in range(side):
+        yield "".join(str(rng.randint(1, 9)) for _ in range(side)) + "\n"
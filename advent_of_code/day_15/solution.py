@@ -1,109 +1,209 @@
-from typing import Iterable, NamedTuple
-from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+from dataclasses import dataclass, field
 import heapq
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.display import show
+from advent_of_code.grid import FourNeighbors, Grid
+from advent_of_code.pathfinding import (
+    Heuristic,
+    SearchResult,
+    bidirectional_search,
+    bucket_search,
+)
+from advent_of_code.puzzle import PuzzleTemplate
 
 
-class Point(NamedTuple):
-    r: int
-    c: int
+class TiledRisks:
+    """
+    Risk levels of the cave repeated down and right, computed on access. Every tile adds one to
+    the risk of the tile above or left of it, wrapping from 9 back to 1.
 
-    def __add__(self, other: "Point") -> "Point":
-        """
-        >>> a, b = Point(1, 2), Point(3, 4)
-        >>> a + b
-        Point(r=4, c=6)
-        """
-        return self.__class__(self.r + other.r, self.c + other.c)
+        >>> risks = TiledRisks(Grid.from_lines(["18"]), repeat_rows=2, repeat_cols=2)
+        >>> [risks[index] for index in range(len(risks))]
+        [1, 8, 2, 9, 2, 9, 3, 1]
 
-    def manhattan_distance(self, other: "Point") -> int:
-        """
-        >>> a, b = Point(1, 2), Point(3, 4)
-        >>> a.manhattan_distance(b)
-        4
-        >>> a.manhattan_distance(b) == b.manhattan_distance(a)
+    Only tables with an entry per row and column of the tiled cave are kept next to the original.
+    """
+
+    def __init__(self, grid: Grid, repeat_rows: int, repeat_cols: int):
+        self.grid = grid
+        self.width = grid.width * repeat_cols
+        self.height = grid.height * repeat_rows
+
+        # where a row or a column starts in the original grid and how much its tile adds
+        self.row_starts = [row % grid.height * grid.width for row in range(self.height)]
+        self.row_increments = [row // grid.height for row in range(self.height)]
+        self.col_offsets = [col % grid.width for col in range(self.width)]
+        self.col_increments = [col // grid.width for col in range(self.width)]
+        self.wrapped = [(risk - 1) % 9 + 1 for risk in range(9 + repeat_rows + repeat_cols)]
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __getitem__(self, index: int) -> int:
+        row, col = divmod(index, self.width)
+        original = self.grid.cells[self.row_starts[row] + self.col_offsets[col]]
+
+        return self.wrapped[original + self.row_increments[row] + self.col_increments[col]]
+
+
+def manhattan_heuristic(width: int, goal: int) -> Heuristic:
+    """
+    Distance to the goal on a grid of the given width, every step costs at least 1 so it is
+    consistent.
+    """
+    goal_row, goal_col = divmod(goal, width)
+
+    def heuristic(point: int) -> int:
+        row, col = divmod(point, width)
+        return abs(goal_row - row) + abs(goal_col - col)
+
+    return heuristic
+
+
+def heap_search(
+    costs: Sequence[int],
+    neighbors: Sequence[Sequence[int]],
+    start: int,
+    goal: int,
+    heuristic: Heuristic,
+) -> Optional[int]:
+    """
+    A* with a binary heap of tuples, a set of visited nodes and a dict of the best costs, which
+    `bucket_search` replaced. Kept as the baseline of `advent_of_code.day_15.bench`.
+
+        >>> puzzle = Puzzle.from_lines(["1163", "1381", "2136", "3694"])
+        >>> risks = TiledRisks(puzzle.grid, repeat_rows=5, repeat_cols=5)
+        >>> neighbors = FourNeighbors(risks.width, risks.height)
+        >>> goal = len(risks) - 1
+        >>> heuristic = manhattan_heuristic(risks.width, goal)
+        >>> heap_search(risks, neighbors, 0, goal, heuristic) == puzzle.task_two()
         True
-        """
-        return abs(self.r - other.r) + abs(self.c - other.c)
+    """
+    heap: list[tuple[int, int]] = [(heuristic(start), start)]
+    visited = set()
+    best_cost: dict[int, int] = {}
+
+    while heap:
+        current_cost_with_heuristics, current_point = heapq.heappop(heap)
+        current_cost = current_cost_with_heuristics - heuristic(current_point)
+
+        if current_point == goal:
+            return current_cost
+
+        if current_point in visited:
+            # we already explored this point with lower cost, ignore it
+            continue
+
+        visited.add(current_point)
+
+        for new_point in neighbors[current_point]:
+            if new_point not in visited:
+                total_cost = current_cost + costs[new_point] + heuristic(new_point)
+                if best_cost.get(new_point, total_cost + 1) > total_cost:
+                    best_cost[new_point] = total_cost
+                    heapq.heappush(heap, (total_cost, new_point))
+
+    return None
 
 
 @dataclass
 class Puzzle(PuzzleTemplate):
-    grid: list[list[int]]
-    rows: int
-    cols: int
+    grid: Grid
+    # distances of full searches by their start, to answer repeated queries
+    distance_fields: dict[int, SearchResult] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
-    def __init__(self, grid: list[list[int]]) -> None:
-        self.grid = grid
-        self.rows = len(grid)
-        self.cols = len(grid[0])
+    @property
+    def rows(self) -> int:
+        return self.grid.height
+
+    @property
+    def cols(self) -> int:
+        return self.grid.width
 
     @classmethod
     def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
-        grid = [[int(char) for char in line.strip()] for line in lines]
+        return cls(grid=Grid.from_lines(lines))
+
+    def search(
+        self,
+        start: int,
+        goal: Optional[int] = None,
+        heuristic: Optional[Heuristic] = None,
+        bidirectional: bool = False,
+    ) -> SearchResult:
+        """
+        Dijkstra (or A* given a heuristic) with a bucket queue, risk levels are 1 to 9. Risks
+        average around 5, so the Manhattan distance prunes too little to pay for itself. Without
+        a goal distances to all cells are computed.
+        """
+        if bidirectional:
+            if goal is None or heuristic is not None:
+                raise ValueError("Bidirectional search needs a goal and supports no heuristic.")
+            return bidirectional_search(self.grid.cells, self.grid.four_connected(), start, goal)
+
+        return bucket_search(
+            self.grid.cells, self.grid.four_connected(), start=start, goal=goal, heuristic=heuristic
+        )
+
+    def distance_field(self, start: int = 0) -> SearchResult:
+        """
+        Distances from the start to all cells, computed once, then any goal is a lookup.
 
-        return cls(grid=grid)
+            >>> puzzle = Puzzle.from_lines(["116", "311", "351"])
+            >>> distances = puzzle.distance_field()
+            >>> puzzle.shortest_path(0, 8), puzzle.shortest_path(0, 6), distances.path(8)
+            (4, 6, [0, 1, 4, 5, 8])
+        """
+        if start not in self.distance_fields:
+            self.distance_fields[start] = self.search(start)
+
+        return self.distance_fields[start]
+
+    def shortest_path(
+        self,
+        start: int,
+        goal: int,
+        heuristic: Optional[Heuristic] = None,
+        bidirectional: bool = False,
+    ) -> Optional[int]:
+        """
+        Cost of a cheapest path, None if the goal can't be reached, like `SearchResult.cost`.
 
-    def is_valid(self, point: Point) -> bool:
-        return 0 <= point.r < self.rows and 0 <= point.c < self.cols
+            >>> puzzle = Puzzle.from_lines(["19"])
+            >>> puzzle.distance_fields[0] = bucket_search([1, 9], [[], []], start=0)
+            >>> puzzle.shortest_path(0, 1) is None
+            True
+        """
+        if start in self.distance_fields:
+            return self.distance_fields[start].distance(goal)
 
-    def heuristics(self, point: Point, goal: Point) -> int:
-        return point.manhattan_distance(goal)
+        result = self.search(start, goal, heuristic=heuristic, bidirectional=bidirectional)
+        show(lambda: f"The search expanded {result.expanded} nodes.")
+        return result.cost
 
-    def shortest_path(self, start: Point, goal: Point) -> int:
+    def path(self, start: int, goal: int, bidirectional: bool = False) -> Optional[list[int]]:
         """
-        A* algorithm for shortest paths.
+        Cells of a cheapest path including both ends.
+
+            >>> Puzzle.from_lines(["116", "311", "351"]).path(0, 8, bidirectional=True)
+            [0, 1, 4, 5, 8]
         """
-        heap: list[tuple[int, Point]] = []
-        heapq.heappush(heap, (self.heuristics(start, goal), start))
-        visited = set()
-        best_cost: dict[Point, int] = {}
-
-        while heap:
-            current_cost_with_heuristics, current_point = heapq.heappop(heap)
-            current_cost = current_cost_with_heuristics - self.heuristics(current_point, goal)
-
-            if current_point == goal:
-                print(f"The search expanded {len(visited)} nodes.")
-                return current_cost
-
-            if current_point in visited:
-                # we already explored this point with lower cost, ignore it
-                continue
-
-            visited.add(current_point)
-
-            for diff in (Point(-1, 0), Point(0, -1), Point(1, 0), Point(0, 1)):
-                new_point = current_point + diff
-                if self.is_valid(new_point) and new_point not in visited:
-                    this_cost = self.grid[new_point.r][new_point.c]
-                    this_heuristics = self.heuristics(new_point, goal)
-                    total_cost = current_cost + this_cost + this_heuristics
-                    if best_cost.get(new_point, total_cost + 1) > total_cost:
-                        best_cost[new_point] = total_cost
-                        heapq.heappush(heap, (total_cost, new_point))
+        if start in self.distance_fields:
+            return self.distance_fields[start].path(goal)
+
+        return self.search(start, goal, bidirectional=bidirectional).path(goal)
 
     def task_one(self) -> int:
-        return self.shortest_path(start=Point(0, 0), goal=Point(r=self.rows - 1, c=self.cols - 1))
+        return self.shortest_path(start=0, goal=len(self.grid) - 1)
 
     def task_two(self, repeat_rows: int = 5, repeat_cols: int = 5) -> int:
-        new_grid = [[0] * self.cols * repeat_cols for _ in range(self.rows * repeat_rows)]
-
-        for row_multiplier in range(0, repeat_rows):
-            for col_multiplier in range(0, repeat_cols):
-                for r in range(self.rows):
-                    for c in range(self.cols):
-                        original = self.grid[r][c]
-                        # position of the point in the new bigger grid
-                        new_r, new_c = (
-                            r + row_multiplier * self.rows,
-                            c + col_multiplier * self.cols,
-                        )
-                        # in each new replication (down and right), the cost grows by one
-                        # and. Values above 9 wrap back around to 1
-                        new_grid[new_r][new_c] = (
-                            (original + row_multiplier + col_multiplier - 1) % 9
-                        ) + 1
-
-        return self.__class__(grid=new_grid).task_one()
+        # the repeated cave is never built, memory of the grid stays that of the original
+        risks = TiledRisks(self.grid, repeat_rows=repeat_rows, repeat_cols=repeat_cols)
+        result = bucket_search(
+            risks, FourNeighbors(risks.width, risks.height), start=0, goal=len(risks) - 1
+        )
+        show(lambda: f"The search expanded {result.expanded} nodes.")
+        return result.cost
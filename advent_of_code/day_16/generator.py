@@ -0,0 +1,70 @@
+from typing import Iterator
+import random
+
+OFFICIAL_LITERALS = 120
+# the comparison operators have always exactly two sub-packets
+COMPARISONS = (5, 6, 7)
+MAX_LENGTH_IN_BITS = 2**15 - 1
+
+
+def literal(version: int, value: int) -> str:
+    """
+    Encodes a literal packet into bits.
+
+        >>> literal(6, 2021)
+        '110100101111111000101'
+    """
+    value_bits = f"{value:b}"
+    value_bits = value_bits.zfill(-(-len(value_bits) // 4) * 4)
+    groups = [value_bits[i : i + 4] for i in range(0, len(value_bits), 4)]
+    body = "".join(("1" if i < len(groups) - 1 else "0") + group for i, group in enumerate(groups))
+
+    return f"{version:03b}100{body}"
+
+
+def operator(version: int, type_id: int, sub_packets: list[str]) -> str:
+    """
+    Encodes an operator packet into bits, prefers length type 0 when the sub-packets fit.
+
+        >>> operator(1, 6, [literal(6, 10), literal(2, 20)])
+        '0011100000000000011011110100010100101001000100100'
+    """
+    bits = "".join(sub_packets)
+    if len(bits) <= MAX_LENGTH_IN_BITS:
+        header = f"0{len(bits):015b}"
+    else:
+        header = f"1{len(sub_packets):011b}"
+
+    return f"{version:03b}{type_id:03b}{header}{bits}"
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields a single line with a hex encoded packet, having about `scale` times as many literal
+    values as the official one. Operators have at most eight sub-packets and products only take
+    a few, to keep the values reasonably small.
+    """
+    rng = random.Random(seed)
+
+    def operator_packet(literals: int, type_ids: tuple[int, ...]) -> str:
+        children = min(literals, rng.randint(2, 8))
+        sizes = [literals // children + (i < literals % children) for i in range(children)]
+        sub_packets = [packet(size) for size in sizes]
+
+        return operator(rng.randrange(8), rng.choice(type_ids), sub_packets)
+
+    def packet(literals: int) -> str:
+        if literals == 1:
+            return literal(rng.randrange(8), rng.randrange(2 ** rng.randint(1, 16)))
+
+        if literals == 2 and rng.random() < 0.5:
+            return operator_packet(literals, COMPARISONS)
+
+        return operator_packet(literals, (0, 1, 2, 3) if literals <= 4 else (0, 2, 3))
+
+    # the outermost packet is a sum, so the answer is always a number
+    bits = operator_packet(max(2, round(OFFICIAL_LITERALS * scale)), (0,))
+    # pad with zeros to whole hexadecimal digits
+    bits += "0" * (-len(bits) % 4)
+
+    yield "".join(f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4)) + "\n"
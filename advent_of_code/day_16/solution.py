@@ -2,7 +2,8 @@ from functools import reduce
 from typing import Callable, Iterable, TypeVar
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.display import show
+from advent_of_code.puzzle import PuzzleTemplate
 import operator
 
 
@@ -110,13 +111,13 @@ class Puzzle(PuzzleTemplate):
 
     @classmethod
     def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
-        line = lines[0].strip()
+        line = next(iter(lines)).strip()
         bits = "".join(f"{int(hex_, base=16):04b}" for hex_ in line)
 
         return cls(packet=parse(iter(bits)))
 
     def task_one(self) -> int:
-        print(self.packet)
+        show(lambda: self.packet)
         return self.packet.version_sum()
 
     def task_two(self) -> int:
@@ -0,0 +1,20 @@
+from typing import Iterator
+import random
+
+OFFICIAL_X = (144, 178)
+OFFICIAL_Y = (-100, -76)
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields the target area with all coordinates `scale` times further from the origin. The
+    input itself doesn't grow, but the number of velocities to try grows quadratically.
+
+        >>> list(generate(scale=1, seed=1))
+        ['target area: x=133..190, y=-105..-72\\n']
+    """
+    rng = random.Random(seed)
+    x_min, x_max = (round(x * scale * rng.uniform(0.9, 1.1)) for x in OFFICIAL_X)
+    y_min, y_max = (round(y * scale * rng.uniform(0.9, 1.1)) for y in OFFICIAL_Y)
+
+    yield f"target area: x={x_min}..{max(x_min, x_max)}, y={min(y_min, y_max)}..{y_max}\n"
@@ -1,7 +1,7 @@
 from typing import Iterable, Optional
 from dataclasses import dataclass
 
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
 
 from math import ceil, sqrt
 
@@ -0,0 +1,28 @@
+from typing import Iterator
+import random
+
+from advent_of_code.day_18.solution import SnailfishNumber
+
+OFFICIAL_LINES = 100
+# reduced snailfish numbers have pairs nested at most four levels deep
+MAX_DEPTH = 4
+
+
+def random_number(rng: random.Random, depth: int = 0) -> SnailfishNumber:
+    if depth > 0 and (depth == MAX_DEPTH or rng.random() < 0.3):
+        return rng.randrange(10)
+
+    return [random_number(rng, depth + 1), random_number(rng, depth + 1)]
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields reduced snailfish numbers, one per line.
+
+        >>> list(generate(scale=0.02, seed=1))
+        ['[1,7]\\n', '[[[[3,1],[6,6]],[[7,4],[3,9]]],[[0,[0,6]],[[0,8],7]]]\\n']
+    """
+    rng = random.Random(seed)
+
+    for _ in range(max(1, round(OFFICIAL_LINES * scale))):
+        yield str(random_number(rng)).replace(" ", "") + "\n"
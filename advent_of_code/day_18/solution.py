@@ -1,7 +1,7 @@
 from typing import Iterable, Optional, Tuple, Union
 from dataclasses import dataclass
 import json
-from advent_of_code.runner import PuzzleTemplate
+from advent_of_code.puzzle import PuzzleTemplate
 from math import ceil, floor
 from functools import reduce
 from itertools import permutations
@@ -0,0 +1,47 @@
+from typing import Any, Callable, Iterator
+from contextlib import contextmanager
+import time
+
+# diagnostics of the solutions are off unless a runner asks for them, so timed code doesn't
+# render anything by default
+_verbose = False
+_display_ns = 0
+
+
+@contextmanager
+def verbose(enabled: bool = True) -> Iterator[None]:
+    global _verbose
+    previous, _verbose = _verbose, enabled
+    try:
+        yield
+    finally:
+        _verbose = previous
+
+
+def is_verbose() -> bool:
+    return _verbose
+
+
+def show(render: Callable[[], Any]):
+    """
+    Prints what `render` returns, it is only called in verbose mode.
+
+        >>> show(lambda: "hidden")
+        >>> with verbose():
+        ...     show(lambda: "shown")
+        shown
+    """
+    global _display_ns
+    if not _verbose:
+        return
+
+    tic = time.perf_counter_ns()
+    print(render())
+    _display_ns += time.perf_counter_ns() - tic
+
+
+def display_ns() -> int:
+    """
+    Total time spent rendering diagnostics, runners subtract it from their measurements.
+    """
+    return _display_ns
@@ -0,0 +1,191 @@
+from typing import Iterable, Iterator, Optional, Sequence
+from array import array
+from dataclasses import dataclass, field
+
+FOUR_CONNECTED = ((-1, 0), (0, -1), (0, 1), (1, 0))
+EIGHT_CONNECTED = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+# maps ASCII digits to their values, so whole lines are converted at once
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+# pads the entries of cells with fewer neighbors in a `neighbor_table`
+NO_NEIGHBOR = -1
+
+
+@dataclass(frozen=True)
+class Neighbors:
+    """
+    Indices of the neighbors of every cell, computed on access so nothing is stored per cell.
+    Inner cells add the offsets turned into index differences, only cells on the border need
+    bounds checks, they just have fewer neighbors.
+
+        >>> neighbors = Neighbors(width=3, height=2, offsets=FOUR_CONNECTED)
+        >>> [neighbors[index] for index in range(len(neighbors))]
+        [[1, 3], [0, 2, 4], [1, 5], [0, 4], [1, 3, 5], [2, 4]]
+        >>> Neighbors(width=3, height=3, offsets=EIGHT_CONNECTED)[4]
+        [0, 1, 2, 3, 5, 6, 7, 8]
+    """
+
+    width: int
+    height: int
+    offsets: Sequence[tuple[int, int]]
+    deltas: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        deltas = tuple(d_row * self.width + d_col for d_row, d_col in self.offsets)
+        object.__setattr__(self, "deltas", deltas)
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __getitem__(self, index: int) -> list[int]:
+        width = self.width
+        col = index % width
+        if width <= index < len(self) - width and 0 < col < width - 1:
+            return [index + delta for delta in self.deltas]
+
+        row = index // width
+        return [
+            index + delta
+            for (d_row, d_col), delta in zip(self.offsets, self.deltas)
+            if 0 <= row + d_row < self.height and 0 <= col + d_col < width
+        ]
+
+
+def neighbor_table(neighbors: Neighbors) -> array:
+    """
+    The neighbors of every cell in one flat array, `len(neighbors.offsets)` entries per cell
+    padded with `NO_NEIGHBOR`. Lookups are cheaper than computing them, at a few bytes per
+    neighbor, so it is meant for loops over the neighbors of small grids.
+
+        >>> table = neighbor_table(Neighbors(width=3, height=2, offsets=FOUR_CONNECTED))
+        >>> table[4 * 4 : 5 * 4].tolist()
+        [1, 3, 5, -1]
+    """
+    stride = len(neighbors.offsets)
+    table = array("i", [NO_NEIGHBOR]) * (stride * len(neighbors))
+    for index in range(len(neighbors)):
+        cells = neighbors[index]
+        table[index * stride : index * stride + len(cells)] = array("i", cells)
+
+    return table
+
+
+@dataclass(frozen=True)
+class FourNeighbors:
+    """
+    Same as `Neighbors` with the 4-connected offsets, the bounds checks are written out as the
+    searches look up neighbors in their innermost loop.
+
+        >>> FourNeighbors(width=3, height=2)[4] == Neighbors(3, 2, FOUR_CONNECTED)[4]
+        True
+    """
+
+    width: int
+    height: int
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __getitem__(self, index: int) -> list[int]:
+        width = self.width
+        col = index % width
+        neighbors = []
+        if index >= width:
+            neighbors.append(index - width)
+        if col:
+            neighbors.append(index - 1)
+        if col + 1 < width:
+            neighbors.append(index + 1)
+        if index + width < width * self.height:
+            neighbors.append(index + width)
+
+        return neighbors
+
+
+@dataclass
+class Grid:
+    """
+    Dense grid of small integers stored row by row in a flat array. Cells are addressed by
+    a single index `row * width + col`.
+
+        >>> grid = Grid.from_lines(["123", "456"])
+        >>> grid.cells[grid.index(1, 2)]
+        6
+        >>> grid.position(4)
+        (1, 1)
+        >>> grid.neighbors(4)
+        [1, 3, 5]
+    """
+
+    cells: array
+    width: int
+    height: int
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Grid":
+        cells = array("b")
+        height = 0
+        for line in lines:
+            cells.frombytes(line.strip().encode().translate(DIGITS))
+            height += 1
+
+        return cls(cells=cells, width=len(cells) // height, height=height)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def position(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.width)
+
+    def neighbors(self, index: int) -> list[int]:
+        return self.four_connected()[index]
+
+    def four_connected(self) -> FourNeighbors:
+        return FourNeighbors(self.width, self.height)
+
+    def eight_connected(self) -> Neighbors:
+        return Neighbors(self.width, self.height, EIGHT_CONNECTED)
+
+    def manhattan_distance(self, a: int, b: int) -> int:
+        """
+        >>> Grid.from_lines(["123", "456"]).manhattan_distance(0, 5)
+        3
+        """
+        (a_row, a_col), (b_row, b_col) = self.position(a), self.position(b)
+        return abs(a_row - b_row) + abs(a_col - b_col)
+
+    def copy(self) -> "Grid":
+        return Grid(
+            cells=array(self.cells.typecode, self.cells), width=self.width, height=self.height
+        )
+
+    def rows(self) -> Iterator[array]:
+        for start in range(0, len(self.cells), self.width):
+            yield self.cells[start : start + self.width]
+
+    def format(self, cells: Optional[Iterable[int]] = None) -> str:
+        """
+        Renders the grid, optionally showing only the given cells.
+
+            >>> print(Grid.from_lines(["123", "456"]).format())
+            123
+            456
+
+            >>> print(Grid.from_lines(["123", "456"]).format(cells=[0, 4]))
+            1..
+            .5.
+        """
+        if cells is None:
+            # tolist converts arrays of any kind to plain ints, which are fast to format
+            return "\n".join("".join(map(str, row.tolist())) for row in self.rows())
+
+        shown = set(cells)
+        return "\n".join(
+            "".join(
+                str(self.cells[index]) if index in shown else "."
+                for index in range(start, start + self.width)
+            )
+            for start in range(0, len(self.cells), self.width)
+        )
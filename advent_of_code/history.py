@@ -0,0 +1,163 @@
+from typing import Iterable, Optional
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import subprocess
+
+from advent_of_code.utils import format_ns, format_table
+
+REPOSITORY_DIRECTORY = Path(__file__).parent.parent
+HISTORY_PATH = REPOSITORY_DIRECTORY / ".benchmarks" / "history.jsonl"
+
+Key = tuple[int, str, str]
+
+
+def git_commit(directory: Path = REPOSITORY_DIRECTORY) -> str:
+    """
+    Returns hash of the checked out commit, suffixed with `+dirty` when there are uncommitted
+    changes - such measurements don't belong to the commit.
+    """
+    commit = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=directory, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=no"],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+    return f"{commit}+dirty" if status else commit
+
+
+def append_records(records: Iterable[dict], commit: str, path: Path = HISTORY_PATH):
+    """
+    Appends benchmark records to the history, the file is never rewritten.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    with path.open("a") as f:
+        for record in records:
+            f.write(json.dumps({"commit": commit, "timestamp": timestamp, **record}) + "\n")
+
+
+def load_history(path: Path = HISTORY_PATH) -> list[dict]:
+    if not path.exists():
+        return []
+
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latest_commit(history: list[dict]) -> Optional[str]:
+    return history[-1]["commit"] if history else None
+
+
+def commit_matches(recorded: str, requested: str) -> bool:
+    """
+    Abbreviated hashes match, but measurements of a dirty tree only match when asked for.
+
+        >>> commit_matches("a6da24ec1d", "a6da24e")
+        True
+
+        >>> commit_matches("a6da24ec1d+dirty", "a6da24e")
+        False
+
+        >>> commit_matches("a6da24ec1d+dirty", "a6da24e+dirty")
+        True
+    """
+    recorded_hash, _, recorded_suffix = recorded.partition("+")
+    requested_hash, _, requested_suffix = requested.partition("+")
+
+    return recorded_hash.startswith(requested_hash) and recorded_suffix == requested_suffix
+
+
+def medians(history: list[dict], commit: str) -> dict[Key, float]:
+    """
+    Returns median per (day, size, phase) of the given commit, accepts abbreviated hashes as
+    long as they are unambiguous. When a commit was measured multiple times, the latest
+    measurement wins.
+
+        >>> history = [
+        ...     {"commit": "abc1", "day": 1, "size": "big", "phase": "parse", "median_ns": 5},
+        ...     {"commit": "abc1", "day": 1, "size": "big", "phase": "parse", "median_ns": 3},
+        ...     {"commit": "def2", "day": 1, "size": "big", "phase": "parse", "median_ns": 9},
+        ... ]
+        >>> medians(history, "abc")
+        {(1, 'big', 'parse'): 3}
+
+        >>> medians(history, "")
+        Traceback (most recent call last):
+        ...
+        ValueError: Commit '' is ambiguous, it matches abc1, def2.
+    """
+    records = [record for record in history if commit_matches(record["commit"], commit)]
+    matching = sorted({record["commit"] for record in records})
+    if len(matching) > 1:
+        raise ValueError(f"Commit '{commit}' is ambiguous, it matches {', '.join(matching)}.")
+
+    return {
+        (record["day"], record["size"], record["phase"]): record["median_ns"] for record in records
+    }
+
+
+@dataclass
+class Comparison:
+    key: Key
+    baseline_ns: float
+    candidate_ns: float
+
+    @property
+    def change(self) -> float:
+        """
+        Relative change of the median, positive means slower.
+
+            >>> Comparison((1, "big", "parse"), baseline_ns=100, candidate_ns=125).change
+            0.25
+        """
+        return self.candidate_ns / self.baseline_ns - 1
+
+    def is_regression(self, threshold: float) -> bool:
+        return self.change > threshold
+
+
+def compare(history: list[dict], baseline: str, candidate: str) -> list[Comparison]:
+    """
+    Pairs medians of all tasks measured in both commits.
+
+        >>> history = [
+        ...     {"commit": "abc1", "day": 15, "size": "big", "phase": "task_two", "median_ns": 10},
+        ...     {"commit": "def2", "day": 15, "size": "big", "phase": "task_two", "median_ns": 15},
+        ...     {"commit": "def2", "day": 18, "size": "big", "phase": "task_two", "median_ns": 15},
+        ... ]
+        >>> [c.is_regression(threshold=0.1) for c in compare(history, "abc1", "def2")]
+        [True]
+    """
+    baseline_medians = medians(history, baseline)
+    candidate_medians = medians(history, candidate)
+
+    return [
+        Comparison(key=key, baseline_ns=baseline_medians[key], candidate_ns=candidate_ns)
+        for key, candidate_ns in sorted(candidate_medians.items())
+        if key in baseline_medians
+    ]
+
+
+def format_comparisons(comparisons: list[Comparison], threshold: float) -> str:
+    header = ("day", "size", "phase", "baseline", "candidate", "change", "status")
+    rows = [
+        (
+            str(comparison.key[0]),
+            comparison.key[1],
+            comparison.key[2],
+            format_ns(comparison.baseline_ns),
+            format_ns(comparison.candidate_ns),
+            f"{comparison.change:+.1%}",
+            "\U0001f40c regression" if comparison.is_regression(threshold) else "ok",
+        )
+        for comparison in comparisons
+    ]
+    return format_table(header, rows)
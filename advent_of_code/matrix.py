@@ -0,0 +1,109 @@
+from typing import Iterable, Optional
+from operator import mul
+
+# dense integer matrices as lists of rows, exact unless a modulus is given
+Matrix = list[list[int]]
+Vector = list[int]
+
+
+def identity(size: int) -> Matrix:
+    return [[int(row == col) for col in range(size)] for row in range(size)]
+
+
+def multiply(a: Matrix, b: Matrix, modulus: Optional[int] = None) -> Matrix:
+    """
+    >>> multiply([[1, 1], [1, 0]], [[1, 1], [1, 0]])
+    [[2, 1], [1, 1]]
+    """
+    columns = list(zip(*b))
+    product = [[sum(map(mul, row, column)) for column in columns] for row in a]
+    if modulus is not None:
+        product = [[value % modulus for value in row] for row in product]
+
+    return product
+
+
+def transform(matrix: Matrix, vector: Vector, modulus: Optional[int] = None) -> Vector:
+    """
+    >>> transform([[1, 1], [1, 0]], [1, 0])
+    [1, 1]
+    """
+    result = [sum(map(mul, row, vector)) for row in matrix]
+    if modulus is not None:
+        result = [value % modulus for value in result]
+
+    return result
+
+
+def squares(matrix: Matrix, count: int, modulus: Optional[int] = None) -> list[Matrix]:
+    """
+    The matrix raised to the powers 1, 2, 4, ..., 2^(count - 1).
+    """
+    result = [matrix][:count]
+    while len(result) < count:
+        result.append(multiply(result[-1], result[-1], modulus))
+
+    return result
+
+
+def advance(
+    vector: Vector, powers: list[Matrix], exponent: int, modulus: Optional[int] = None
+) -> Vector:
+    """
+    Applies the matrix `exponent` times, picking from the `squares` of the matrix by the bits of
+    the exponent. Matrix-vector products are cheaper than matrix powers.
+    """
+    if exponent >= 1 << len(powers):
+        raise ValueError(f"Exponent {exponent} needs more than {len(powers)} squares.")
+
+    for bit, power in enumerate(powers):
+        if exponent >> bit & 1:
+            vector = transform(power, vector, modulus)
+
+    return vector
+
+
+def power(matrix: Matrix, exponent: int, modulus: Optional[int] = None) -> Matrix:
+    """
+    Exponentiation by squaring, takes a logarithmic number of multiplications.
+
+        >>> power([[1, 1], [1, 0]], 10)
+        [[89, 55], [55, 34]]
+        >>> power([[1, 1], [1, 0]], 10**18, modulus=1000)
+        [[501, 875], [875, 626]]
+    """
+    result = identity(len(matrix))
+    for square in squares(matrix, exponent.bit_length(), modulus):
+        if exponent & 1:
+            result = multiply(result, square, modulus)
+        exponent >>= 1
+
+    return result
+
+
+def transform_many(
+    matrix: Matrix, vector: Vector, exponents: Iterable[int], modulus: Optional[int] = None
+) -> list[Vector]:
+    """
+    The vector transformed by the matrix raised to each of the exponents. Exponents are visited
+    in ascending order, each step only advances by the difference to the previous one, and the
+    squares of the matrix are computed once for all of them.
+
+        >>> transform_many([[1, 1], [1, 0]], [1, 0], [10, 1, 10])
+        [[89, 55], [1, 1], [89, 55]]
+    """
+    exponents = list(exponents)
+    ordered = sorted(set(exponents))
+    if not ordered:
+        return []
+
+    largest_step = max(b - a for a, b in zip([0, *ordered], ordered))
+    powers = squares(matrix, largest_step.bit_length(), modulus)
+
+    results = {}
+    previous = 0
+    for exponent in ordered:
+        vector = advance(vector, powers, exponent - previous, modulus)
+        results[exponent], previous = vector, exponent
+
+    return [results[exponent] for exponent in exponents]
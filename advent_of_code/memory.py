@@ -0,0 +1,142 @@
+from typing import Callable, Iterable, Type
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import sys
+import tracemalloc
+
+# grow by at least this much over the last snapshot before taking a new one near the peak
+SNAPSHOT_GROWTH = 1.1
+IGNORED_FILES = (tracemalloc.__file__, __file__)
+
+
+def format_bytes(size: float) -> str:
+    """
+    Formats a number of bytes using the most readable binary unit.
+
+        >>> format_bytes(532)
+        '532 B'
+
+        >>> format_bytes(3 * 1024 ** 2 + 1)
+        '3.0 MiB'
+    """
+    for unit, scale in (("GiB", 1024**3), ("MiB", 1024**2), ("KiB", 1024)):
+        if abs(size) >= scale:
+            return f"{size / scale:.1f} {unit}"
+
+    return f"{size:.0f} B"
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryStats:
+    # highest traced memory above the level before the phase started
+    peak_bytes: int
+    # memory still held after the phase and its result are gone (e.g. caches)
+    retained_bytes: int
+    # number of memory blocks allocated by the phase and alive at its (near) peak
+    peak_blocks: int
+    # sites that allocated most of the memory alive at the (near) peak
+    top_sites: list[AllocationSite] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _PeakSnapshots:
+    """
+    Takes a snapshot whenever the traced memory grows noticeably, checked on every Python
+    function call and return. The last snapshot is then close to the peak of the phase.
+    """
+
+    def __init__(self):
+        self.threshold = 0
+        self.snapshot = None
+
+    def __call__(self, frame, event, arg):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.threshold:
+            self.snapshot = tracemalloc.take_snapshot()
+            # the snapshot itself is traced, don't count it in
+            self.threshold = tracemalloc.get_traced_memory()[0] * SNAPSHOT_GROWTH
+
+
+def _site(statistic: tracemalloc.StatisticDiff) -> AllocationSite:
+    frame = statistic.traceback[0]
+    return AllocationSite(
+        location=f"{'/'.join(Path(frame.filename).parts[-2:])}:{frame.lineno}",
+        size=statistic.size_diff,
+        count=statistic.count_diff,
+    )
+
+
+def measure_memory(func: Callable[[], object], top: int = 5) -> MemoryStats:
+    """
+    Traces memory allocations of `func` with tracemalloc.
+
+    `func` is called twice: first to measure the peak precisely, then with a profile hook taking
+    snapshots near the peak to find the top allocation sites, which distorts the numbers.
+
+        >>> stats = measure_memory(lambda: [0] * 1_000_000, top=1)
+        >>> stats.peak_bytes >= 8_000_000, stats.retained_bytes < 1_000
+        (True, True)
+        >>> stats.top_sites[0].location
+        '<doctest advent_of_code.memory.measure_memory[0]>:1'
+    """
+    filters = [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES]
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func()
+        del result
+        after, peak = tracemalloc.get_traced_memory()
+
+        # filtering compiles and caches the patterns, do it before the baseline snapshot
+        tracemalloc.take_snapshot().filter_traces(filters)
+        baseline = tracemalloc.take_snapshot().filter_traces(filters)
+        snapshots = _PeakSnapshots()
+        snapshots.threshold = tracemalloc.get_traced_memory()[0] * SNAPSHOT_GROWTH
+        sys.setprofile(snapshots)
+        try:
+            func()
+        finally:
+            sys.setprofile(None)
+    finally:
+        tracemalloc.stop()
+
+    stats = MemoryStats(peak_bytes=peak - before, retained_bytes=after - before, peak_blocks=0)
+    if snapshots.snapshot is not None:
+        differences = [
+            difference
+            for difference in snapshots.snapshot.filter_traces(filters).compare_to(
+                baseline, "lineno"
+            )
+            if difference.size_diff > 0
+        ]
+        stats.peak_blocks = sum(max(0, difference.count_diff) for difference in differences)
+        stats.top_sites = [_site(difference) for difference in differences[:top]]
+
+    return stats
+
+
+def profile_memory(
+    puzzle_class: Type, lines: Iterable[str], top: int = 5
+) -> dict[str, MemoryStats]:
+    """
+    Measures memory of parsing and both tasks separately, the tasks run on a single parsed
+    instance, so its memory is not attributed to them.
+    """
+    lines = list(lines)
+    puzzle = puzzle_class.from_lines(lines)
+
+    return {
+        "parse": measure_memory(lambda: puzzle_class.from_lines(lines), top=top),
+        "task_one": measure_memory(puzzle.task_one, top=top),
+        "task_two": measure_memory(puzzle.task_two, top=top),
+    }
@@ -0,0 +1,182 @@
+from typing import Callable, Optional, Sequence
+from array import array
+from dataclasses import dataclass
+
+UNREACHED = 2**62
+NO_NODE = -1
+
+Heuristic = Callable[[int], int]
+
+
+@dataclass
+class SearchResult:
+    """
+    Outcome of a search. Distances are exact for every node expanded before the search stopped,
+    other nodes keep a tentative distance or `UNREACHED`.
+    """
+
+    cost: Optional[int]
+    distances: array
+    previous: array
+    expanded: int
+
+    def distance(self, node: int) -> Optional[int]:
+        """
+        Cost from the start to the given node, None if it has not been reached.
+        """
+        distance = self.distances[node]
+        return None if distance == UNREACHED else distance
+
+    def path(self, node: int) -> Optional[list[int]]:
+        """
+        Nodes from the start to the given node, None if it has not been reached.
+        """
+        if self.distances[node] == UNREACHED:
+            return None
+
+        path = [node]
+        while self.previous[node] != NO_NODE:
+            node = self.previous[node]
+            path.append(node)
+
+        return path[::-1]
+
+
+def bucket_search(
+    costs: Sequence[int],
+    neighbors: Sequence[Sequence[int]],
+    start: int,
+    goal: Optional[int] = None,
+    heuristic: Optional[Heuristic] = None,
+) -> SearchResult:
+    """
+    Dial's algorithm, i.e. Dijkstra with a bucket queue. Nodes are integers, entering a node costs
+    `costs[node]`, which must be small non-negative integers, so a list of buckets indexed by
+    priority replaces the heap. With a consistent `heuristic` it becomes A*. Without a `goal`
+    distances to all reachable nodes are computed.
+
+        >>> costs = [1, 1, 6, 3, 1, 1, 3, 5, 1]  # 3x3 grid
+        >>> neighbors = [(1, 3), (0, 2, 4), (1, 5), (0, 4, 6), (1, 3, 5, 7), (2, 4, 8), (3, 7),
+        ...              (4, 6, 8), (5, 7)]
+        >>> bucket_search(costs, neighbors, start=0, goal=8).cost
+        4
+        >>> list(bucket_search(costs, neighbors, start=0).distances)
+        [0, 1, 7, 3, 2, 3, 6, 7, 4]
+        >>> bucket_search(costs, neighbors, start=0, goal=8).path(8)
+        [0, 1, 4, 5, 8]
+    """
+    distances = array("q", [UNREACHED]) * len(costs)
+    distances[start] = 0
+    previous = array("q", [NO_NODE]) * len(costs)
+
+    priority = heuristic(start) if heuristic else 0
+    buckets: list[list[int]] = [[] for _ in range(priority)] + [[start]]
+    expanded = 0
+
+    while priority < len(buckets):
+        bucket = buckets[priority]
+        while bucket:
+            node = bucket.pop()
+            distance = distances[node]
+            if distance + (heuristic(node) if heuristic else 0) != priority:
+                # the node has been reached cheaper since it was queued, this entry is stale
+                continue
+
+            if node == goal:
+                return SearchResult(distance, distances, previous, expanded)
+
+            expanded += 1
+            for neighbor in neighbors[node]:
+                new_distance = distance + costs[neighbor]
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = node
+                    new_priority = new_distance + heuristic(neighbor) if heuristic else new_distance
+                    while len(buckets) <= new_priority:
+                        buckets.append([])
+                    buckets[new_priority].append(neighbor)
+
+        # drop the processed bucket, priorities never decrease
+        buckets[priority] = None
+        priority += 1
+
+    return SearchResult(None, distances, previous, expanded)
+
+
+def bidirectional_search(
+    costs: Sequence[int], neighbors: Sequence[Sequence[int]], start: int, goal: int
+) -> SearchResult:
+    """
+    Dijkstra from both ends at once, always expanding the side with the lower priority. Stops
+    once the priorities of both sides add up to the best connection found, the searches then
+    cover two small discs instead of one large. Neighbors must be symmetric.
+
+    Distances are the ones of the forward search, the path to the goal is complete.
+
+        >>> costs = [1, 1, 6, 3, 1, 1, 3, 5, 1]  # 3x3 grid
+        >>> neighbors = [(1, 3), (0, 2, 4), (1, 5), (0, 4, 6), (1, 3, 5, 7), (2, 4, 8), (3, 7),
+        ...              (4, 6, 8), (5, 7)]
+        >>> result = bidirectional_search(costs, neighbors, start=0, goal=8)
+        >>> result.cost, result.path(8)
+        (4, [0, 1, 4, 5, 8])
+    """
+    size = len(costs)
+    # backward distances don't include the cost of entering the node itself, so a path through
+    # a node costs the sum of both distances
+    forward, backward = array("q", [UNREACHED]) * size, array("q", [UNREACHED]) * size
+    previous, following = array("q", [NO_NODE]) * size, array("q", [NO_NODE]) * size
+    forward[start], backward[goal] = 0, 0
+
+    buckets: tuple[list[list[int]], list[list[int]]] = ([[start]], [[goal]])
+    priorities = [0, 0]
+    best, meeting = (0, start) if start == goal else (UNREACHED, NO_NODE)
+    expanded = 0
+
+    while True:
+        for side in (0, 1):
+            while priorities[side] < len(buckets[side]) and not buckets[side][priorities[side]]:
+                buckets[side][priorities[side]] = None
+                priorities[side] += 1
+        if any(priority == len(queue) for priority, queue in zip(priorities, buckets)):
+            break  # one side ran out of nodes, there is nothing left to connect
+        if priorities[0] + priorities[1] >= best:
+            break
+
+        side = 0 if priorities[0] <= priorities[1] else 1
+        priority = priorities[side]
+        node = buckets[side][priority].pop()
+        if (forward, backward)[side][node] != priority:
+            continue  # stale entry
+
+        expanded += 1
+        for neighbor in neighbors[node]:
+            if side == 0:
+                new_distance = priority + costs[neighbor]
+                if new_distance >= forward[neighbor]:
+                    continue
+                forward[neighbor] = new_distance
+                previous[neighbor] = node
+            else:
+                new_distance = priority + costs[node]
+                if new_distance >= backward[neighbor]:
+                    continue
+                backward[neighbor] = new_distance
+                following[neighbor] = node
+
+            while len(buckets[side]) <= new_distance:
+                buckets[side].append([])
+            buckets[side][new_distance].append(neighbor)
+
+            if forward[neighbor] + backward[neighbor] < best:
+                best, meeting = forward[neighbor] + backward[neighbor], neighbor
+
+    if meeting == NO_NODE:
+        return SearchResult(None, forward, previous, expanded)
+
+    # link the second half of the path, so it can be read from the start
+    node = meeting
+    while node != goal:
+        previous[following[node]], node = node, following[node]
+    forward[goal] = best
+
+    return SearchResult(best, forward, previous, expanded)
@@ -0,0 +1,101 @@
+from typing import Callable, TypeVar
+from pathlib import Path
+import cProfile
+import pstats
+
+T = TypeVar("T")
+Function = tuple[str, int, str]
+
+# stacks contributing less than a microsecond are not worth drawing
+MIN_WEIGHT_US = 1
+
+
+def profile_call(func: Callable[[], T]) -> tuple[T, cProfile.Profile]:
+    profile = cProfile.Profile()
+    result = profile.runcall(func)
+    return result, profile
+
+
+def label(function: Function) -> str:
+    """
+    Names a function for a collapsed stack, semicolons are reserved as separators.
+
+        >>> label(("/root/advent_of_code/day_17/solution.py", 112, "simulate_shot"))
+        'simulate_shot (solution.py:112)'
+
+        >>> label(("~", 0, "<built-in method builtins.max>"))
+        '<built-in method builtins.max>'
+    """
+    filename, line, name = function
+    if filename == "~":
+        return name.replace(";", ",")
+
+    return f"{name} ({Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    """
+    Converts profile statistics into collapsed stacks (`root;child;leaf`) with self time in
+    microseconds, the input format of flamegraph tools.
+
+    cProfile only records caller-callee pairs, not whole stacks. Time of a function called from
+    multiple places is split among its callers by their share of its cumulative time, so deeper
+    stacks are an approximation.
+
+        >>> def leaf():
+        ...     return sum(range(100_000))
+        >>> def root():
+        ...     return leaf() + leaf()
+        >>> _, profile = profile_call(root)
+        >>> stacks = collapsed_stacks(pstats.Stats(profile))
+        >>> sum_stacks = [stack.split(";") for stack in stacks if "builtins.sum" in stack]
+        >>> [(stack[-3].split()[0], stack[-2].split()[0]) for stack in sum_stacks]
+        [('root', 'leaf')]
+    """
+    callees: dict[Function, dict[Function, float]] = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative
+
+    stacks: dict[str, int] = {}
+
+    def walk(function: Function, stack: list[str], fraction: float):
+        _, _, own_time, cumulative_time, _ = stats.stats[function]
+        stack = [*stack, label(function)]
+
+        weight = round(own_time * fraction * 10**6)
+        if weight >= MIN_WEIGHT_US:
+            key = ";".join(stack)
+            stacks[key] = stacks.get(key, 0) + weight
+
+        for callee, edge_time in callees.get(function, {}).items():
+            callee_time = stats.stats[callee][3]
+            # skip recursion, its time is already accounted for in the outermost call
+            if callee_time and label(callee) not in stack:
+                callee_fraction = fraction * edge_time / callee_time
+                if callee_time * callee_fraction * 10**6 >= MIN_WEIGHT_US:
+                    walk(callee, stack, callee_fraction)
+
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            walk(function, [], 1.0)
+
+    return stacks
+
+
+def write_profile(profile: cProfile.Profile, stem: Path) -> tuple[Path, Path]:
+    """
+    Writes `<stem>.pstats` for `pstats`/snakeviz and `<stem>.collapsed` for flamegraph tools.
+    """
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    pstats_path = stem.with_name(f"{stem.name}.pstats")
+    collapsed_path = stem.with_name(f"{stem.name}.collapsed")
+
+    stats = pstats.Stats(profile)
+    stats.dump_stats(pstats_path)
+
+    with collapsed_path.open("w") as f:
+        for stack, weight in sorted(collapsed_stacks(stats).items()):
+            f.write(f"{stack} {weight}\n")
+
+    return pstats_path, collapsed_path
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Union
+
+
+class PuzzleTemplate(ABC):
+    @classmethod
+    @abstractmethod
+    def from_lines(cls, lines: Iterable[str]) -> "PuzzleTemplate":
+        raise NotImplementedError()
+
+    @abstractmethod
+    def task_one(self) -> Union[str, int]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def task_two(self) -> Union[str, int]:
+        raise NotImplementedError()
+
+    @classmethod
+    def solve_stream(cls, lines: Iterable[str]) -> tuple[Union[str, int], Union[str, int]]:
+        """
+        Optionally solves both tasks in a single pass over the lines, without keeping the whole
+        input in memory.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def supports_streaming(cls) -> bool:
+        return cls.solve_stream.__func__ is not PuzzleTemplate.solve_stream.__func__
+
+    def solve_both(self) -> tuple[Union[str, int], Union[str, int]]:
+        """
+        Optionally solves both tasks at once, sharing the work they have in common. The runner
+        prefers it over calling the tasks one after another.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def supports_solve_both(cls) -> bool:
+        return cls.solve_both is not PuzzleTemplate.solve_both
@@ -0,0 +1,68 @@
+from typing import Type
+from importlib import import_module
+from pathlib import Path
+import re
+
+from advent_of_code.puzzle import PuzzleTemplate
+
+PACKAGE_DIRECTORY = Path(__file__).parent
+DAY_DIRECTORY = re.compile(r"day_(\d+)")
+
+
+def discover_days(directory: Path = PACKAGE_DIRECTORY) -> dict[int, Path]:
+    """
+    Finds all `day_NN` packages containing a solution, without importing them.
+
+        >>> list(discover_days())[:3]
+        [1, 2, 3]
+    """
+    days = {}
+    for path in directory.iterdir():
+        match = DAY_DIRECTORY.fullmatch(path.name)
+        if match and (path / "solution.py").exists():
+            days[int(match.group(1))] = path
+
+    return dict(sorted(days.items()))
+
+
+def parse_days(spec: str) -> list[int]:
+    """
+    Parses a comma separated list of days and inclusive ranges of days.
+
+        >>> parse_days("1-3,7")
+        [1, 2, 3, 7]
+
+        >>> parse_days("5,2,5")
+        [2, 5]
+
+        >>> parse_days("abc")
+        Traceback (most recent call last):
+        ...
+        ValueError: Unknown days 'abc', use days and ranges of days like 1-5,7.
+
+        >>> parse_days("3-1")
+        Traceback (most recent call last):
+        ...
+        ValueError: Range of days '3-1' is empty.
+    """
+    days = set()
+    for part in spec.split(","):
+        first, _, last = part.strip().partition("-")
+        try:
+            first, last = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(
+                f"Unknown days '{spec}', use days and ranges of days like 1-5,7."
+            ) from None
+        if first > last:
+            raise ValueError(f"Range of days '{part.strip()}' is empty.")
+        days.update(range(first, last + 1))
+
+    return sorted(days)
+
+
+def load_puzzle(day: int) -> Type[PuzzleTemplate]:
+    """
+    Imports the solution of the day, nothing is imported until a day is actually scheduled.
+    """
+    return import_module(f"{__package__}.day_{day:02d}.solution").Puzzle
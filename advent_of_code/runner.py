@@ -1,36 +1,41 @@
-from abc import ABC, abstractmethod
-from typing import Callable, Iterable, Optional, Type, TypeVar, Union
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Type, TypeVar, Union
 import click
 import time
-from datetime import timedelta
 from pathlib import Path
 from typing import Any
 from enum import Enum
+from dataclasses import dataclass
+from contextlib import contextmanager, redirect_stdout
+from functools import partial
+from importlib import import_module
+import io
 
+from advent_of_code.display import display_ns, verbose
+from advent_of_code.puzzle import PuzzleTemplate
+from advent_of_code.registry import DAY_DIRECTORY, PACKAGE_DIRECTORY, load_puzzle
+from advent_of_code.utils import format_ns, format_table
 
-class PuzzleTemplate(ABC):
-    @classmethod
-    @abstractmethod
-    def from_lines(cls, lines: Iterable[str]) -> "PuzzleTemplate":
-        raise NotImplementedError()
-
-    @abstractmethod
-    def task_one(self) -> Union[str, int]:
-        raise NotImplementedError()
-
-    @abstractmethod
-    def task_two(self) -> Union[str, int]:
-        raise NotImplementedError()
-
+# benchmarking, memory tracing and caching pull in statistics, tracemalloc and hashlib, they are
+# imported by the code paths that use them to keep the cold start of a single day fast
+if TYPE_CHECKING:
+    from advent_of_code.benchmark import Stats
+    from advent_of_code.cache import ResultCache
+    from advent_of_code.memory import MemoryStats
 
 T = TypeVar("T")
+U = TypeVar("U")
+V = TypeVar("V")
 
 
-def time_it(func: Callable[[], T]) -> T:
-    tic = time.time()
+def time_it(func: Callable[[], T], label: str = "Execution took") -> T:
+    """
+    Runs the function and prints how long it took, without the time spent rendering diagnostics.
+    """
+    shown = display_ns()
+    tic = time.perf_counter_ns()
     result = func()
-    toc = time.time()
-    print(f"Execution took: {timedelta(seconds=toc - tic)}")
+    toc = time.perf_counter_ns()
+    print(f"{label}: {format_ns(toc - tic - (display_ns() - shown))}")
     return result
 
 
@@ -42,48 +47,609 @@ def get_solution(path: Path) -> Optional[str]:
     return None
 
 
-def verify_solution(actual: Any, expected: str):
-    _actual = str(actual)
+def check_solution(actual: Any, expected: Optional[str]) -> Optional[bool]:
+    """
+    Returns whether the solution matches the expected one or None if it is not known yet.
+
+        >>> check_solution(42, "42")
+        True
+
+        >>> check_solution(41, "42")
+        False
+
+        >>> check_solution(42, None)
+    """
     if not expected:
+        return None
+
+    return expected == str(actual)
+
+
+def verify_solution(actual: Any, expected: str):
+    correct = check_solution(actual, expected)
+    if correct is None:
         print(f"\U00002753\n{actual}")
-    elif expected == _actual:
+    elif correct:
         print(f"\U00002705\n{actual}")
     else:
         print(f"\U0000274C\n{actual}\n\nthe correct solution is:\n\n{expected}")
 
 
+class Task(Enum):
+    ONE = "one"
+    TWO = "two"
+
+
 class InstanceSize(Enum):
     SMALL = "small"
     BIG = "big"
 
+    def read_lines(self, directory: Path) -> list[str]:
+        with (directory / "assets" / f"input_{self.value}.txt").open() as f:
+            return f.readlines()
+
+    @contextmanager
+    def open_lines(self, directory: Path, use_mmap: bool = False) -> Iterator[Iterator[str]]:
+        """
+        Provides the lines lazily, read from the file or its memory map as they are consumed.
+        """
+        path = directory / "assets" / f"input_{self.value}.txt"
+        if not use_mmap:
+            with path.open() as f:
+                yield f
+            return
+
+        import mmap
+
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield (line.decode() for line in iter(mapped.readline, b""))
+
+    def expected(self, directory: Path, task: Task) -> Optional[str]:
+        return get_solution(directory / "assets" / f"solution_{self.value}_{task.value}.txt")
+
+    def digest(self, directory: Path) -> str:
+        from advent_of_code.cache import file_digest
+
+        return file_digest(directory / "assets" / f"input_{self.value}.txt")
+
+
+@dataclass(frozen=True)
+class GeneratedInstance:
+    """
+    Random input produced by `generator.generate` of the given day. The `scale` is relative to
+    the size of the official big input. Answers are not known, so they can't be verified.
+    """
+
+    scale: float
+    seed: int = 0
+
+    @property
+    def value(self) -> str:
+        """
+        >>> GeneratedInstance(scale=100).value
+        'generated:100'
+
+        >>> GeneratedInstance(scale=0.5, seed=7).value
+        'generated:0.5:7'
+        """
+        seed = f":{self.seed}" if self.seed else ""
+        return f"generated:{self.scale:g}{seed}"
+
+    def read_lines(self, directory: Path) -> list[str]:
+        with self.open_lines(directory) as lines:
+            return list(lines)
+
+    @contextmanager
+    def open_lines(self, directory: Path, use_mmap: bool = False) -> Iterator[Iterator[str]]:
+        """
+        Provides the lines lazily as they are generated, there is no file to map.
+        """
+        generator = import_module(f"{__package__}.{directory.name}.generator")
+        yield generator.generate(scale=self.scale, seed=self.seed)
+
+    def expected(self, directory: Path, task: Task) -> Optional[str]:
+        return None
+
+    def digest(self, directory: Path) -> str:
+        from advent_of_code.cache import file_digest
+
+        # generated lines are fully determined by the generator and its arguments
+        return f"{file_digest(directory / 'generator.py')}:{self.value}"
+
+
+Instance = Union[InstanceSize, GeneratedInstance]
+
 
-def _puzzle_runner(puzzle: Type[PuzzleTemplate], instance_size: InstanceSize, directory: Path):
+def parse_instance(spec: str) -> Instance:
+    """
+    Parses `small`, `big` or `generated:<scale>[:<seed>]`.
+
+        >>> parse_instance("big")
+        <InstanceSize.BIG: 'big'>
+
+        >>> parse_instance("generated:1000")
+        GeneratedInstance(scale=1000.0, seed=0)
+
+        >>> parse_instance("generated:10:3")
+        GeneratedInstance(scale=10.0, seed=3)
+
+        >>> parse_instance("huge")
+        Traceback (most recent call last):
+        ...
+        ValueError: Unknown instance 'huge', use small, big or generated:<scale>[:<seed>].
+    """
+    kind, _, parameters = spec.strip().partition(":")
+    try:
+        if kind == "generated" and parameters:
+            scale, _, seed = parameters.partition(":")
+            return GeneratedInstance(scale=float(scale), seed=int(seed or 0))
+
+        return InstanceSize(spec.strip())
+    except ValueError:
+        raise ValueError(
+            f"Unknown instance '{spec}', use small, big or generated:<scale>[:<seed>]."
+        ) from None
+
+
+def _profiled(func: Callable[[], T], stem: Path) -> T:
+    # cProfile and pstats are imported only when profiling, they slow down every cold start
+    from advent_of_code.profiling import profile_call, write_profile
+
+    # the profiler slows the function down, the time is labeled as such and excludes writing
+    result, profile = time_it(lambda: profile_call(func), "Profiled execution took")
+    for path in write_profile(profile, stem):
+        print(f"Profile written to {path}")
+
+    return result
+
+
+def _stream_runner(
+    puzzle: Type[PuzzleTemplate], instance_size: Instance, directory: Path, use_mmap: bool = False
+):
+    print(f"--- \N{christmas tree} Streaming {instance_size.value} instance \N{christmas tree} ---")
+    with instance_size.open_lines(directory, use_mmap=use_mmap) as lines:
+        one, two = time_it(lambda: puzzle.solve_stream(lines))
+
+    verify_solution(one, instance_size.expected(directory, Task.ONE))
+    print()
+    verify_solution(two, instance_size.expected(directory, Task.TWO))
+
+
+def _puzzle_runner(
+    puzzle: Type[PuzzleTemplate],
+    instance_size: Instance,
+    directory: Path,
+    profile_directory: Optional[Path] = None,
+    use_mmap: bool = False,
+):
     print(f"--- \N{christmas tree} Running {instance_size.value} instance \N{christmas tree} ---")
-    directory = directory / "assets"
-    puzzle_input = directory / f"input_{instance_size.value}.txt"
-    with puzzle_input.open() as f:
-        puzzle = puzzle.from_lines(f.readlines())
-        one = time_it(lambda: puzzle.task_one())
-        verify_solution(one, get_solution(directory / f"solution_{instance_size.value}_one.txt"))
+    with instance_size.open_lines(directory, use_mmap=use_mmap) as lines:
+        puzzle = puzzle.from_lines(lines)
+
+    def solve(name: str) -> Any:
+        func = puzzle.solve_both if name == "both" else getattr(puzzle, f"task_{name}")
+        if profile_directory is None:
+            return time_it(func)
 
+        # e.g. day_17_generated_10_one, colons are not welcome in file names
+        name = f"{directory.name}_{instance_size.value}_{name}".replace(":", "_")
+        return _profiled(func, profile_directory / name)
+
+    if puzzle.supports_solve_both():
+        one, two = solve("both")
+        verify_solution(one, instance_size.expected(directory, Task.ONE))
         print()
+        verify_solution(two, instance_size.expected(directory, Task.TWO))
+        return
+
+    one = solve(Task.ONE.value)
+    verify_solution(one, instance_size.expected(directory, Task.ONE))
+
+    print()
+
+    two = solve(Task.TWO.value)
+    verify_solution(two, instance_size.expected(directory, Task.TWO))
+
+
+def benchmark_instance(
+    puzzle: Type[PuzzleTemplate],
+    instance_size: Instance,
+    directory: Path,
+    repeat: int = 10,
+    warmup: int = 1,
+) -> dict[str, "Stats"]:
+    from advent_of_code.benchmark import benchmark_puzzle
+
+    lines = instance_size.read_lines(directory)
+
+    # don't let the solutions' printing distort the measurements
+    with redirect_stdout(io.StringIO()):
+        return benchmark_puzzle(puzzle, lines, repeat=repeat, warmup=warmup)
+
+
+def benchmark_records(day: int, instance_size: Instance, stats: dict[str, "Stats"]) -> list[dict]:
+    """
+    Flattens benchmark results into JSON serializable records. The `solve_both` record also
+    carries the time it saves over solving the tasks separately.
+
+        >>> from advent_of_code.benchmark import Stats
+        >>> stats = {"parse": Stats(repeat=1, min_ns=1, median_ns=1, p95_ns=1, stddev_ns=0.0)}
+        >>> benchmark_records(1, InstanceSize.SMALL, stats)  # doctest: +NORMALIZE_WHITESPACE
+        [{'day': 1, 'size': 'small', 'phase': 'parse',
+          'repeat': 1, 'min_ns': 1, 'median_ns': 1, 'p95_ns': 1, 'stddev_ns': 0.0}]
+    """
+    records = [
+        {"day": day, "size": instance_size.value, "phase": phase, **phase_stats.to_dict()}
+        for phase, phase_stats in stats.items()
+    ]
+    if "solve_both" in stats:
+        from advent_of_code.benchmark import saved_ns
+
+        records[-1]["saved_ns"] = saved_ns(stats)
+
+    return records
+
+
+def format_benchmark(records: list[dict]) -> str:
+    header = ("day", "size", "phase", "min", "median", "p95", "stddev", "saved")
+    rows = [
+        (
+            str(record["day"]),
+            record["size"],
+            record["phase"],
+            *(format_ns(record[key]) for key in ("min_ns", "median_ns", "p95_ns", "stddev_ns")),
+            format_ns(record["saved_ns"]) if "saved_ns" in record else "",
+        )
+        for record in records
+    ]
+    return format_table(header, rows)
 
-        two = time_it(lambda: puzzle.task_two())
-        verify_solution(two, get_solution(directory / f"solution_{instance_size.value}_two.txt"))
+
+def memory_instance(
+    puzzle: Type[PuzzleTemplate], instance_size: Instance, directory: Path, top: int = 5
+) -> dict[str, "MemoryStats"]:
+    from advent_of_code.memory import profile_memory
+
+    lines = instance_size.read_lines(directory)
+
+    with redirect_stdout(io.StringIO()):
+        return profile_memory(puzzle, lines, top=top)
+
+
+def memory_records(
+    day: int, instance_size: Instance, stats: dict[str, "MemoryStats"]
+) -> list[dict]:
+    return [
+        {"day": day, "size": instance_size.value, "phase": phase, **phase_stats.to_dict()}
+        for phase, phase_stats in stats.items()
+    ]
+
+
+def format_memory(records: list[dict]) -> str:
+    from advent_of_code.memory import format_bytes
+
+    header = ("day", "size", "phase", "peak", "retained", "blocks")
+    rows = [
+        (
+            str(record["day"]),
+            record["size"],
+            record["phase"],
+            format_bytes(record["peak_bytes"]),
+            format_bytes(record["retained_bytes"]),
+            str(record["peak_blocks"]),
+        )
+        for record in records
+    ]
+    sections = [format_table(header, rows)]
+
+    for record in records:
+        if record["top_sites"]:
+            sites = [
+                (f"  {site['location']}", format_bytes(site["size"]), str(site["count"]))
+                for site in record["top_sites"]
+            ]
+            title = (
+                f"Top allocation sites of day {record['day']} {record['size']} {record['phase']}"
+            )
+            sections.append(f"{title}:\n{format_table(('  site', 'size', 'blocks'), sites)}")
+
+    return "\n\n".join(sections)
+
+
+def write_json(records: list[dict], path: str):
+    import json
+
+    with click.open_file(path, "w") as f:
+        json.dump(records, f, indent=2)
+        f.write("\n")
 
 
 def attach_cli(puzzle: Type[PuzzleTemplate], directory: Path):
     @click.command()
     @click.option("--small", is_flag=True, help="Computes solution for the small puzzle instance")
     @click.option("--big", is_flag=True, help="Computes solutions for the big puzzle instance")
-    def solve(small: bool, big: bool):
-        if small:
-            _puzzle_runner(puzzle, InstanceSize.SMALL, directory)
+    @click.option(
+        "--size",
+        "sizes",
+        multiple=True,
+        help="Computes solutions for small, big or generated:<scale>[:<seed>] instance",
+    )
+    @click.option("--bench", is_flag=True, help="Benchmarks parsing and both tasks instead")
+    @click.option("--repeat", default=10, show_default=True, help="Measured runs per phase")
+    @click.option("--warmup", default=1, show_default=True, help="Unmeasured runs per phase")
+    @click.option("--memory", is_flag=True, help="Traces memory of parsing and both tasks instead")
+    @click.option("--top", default=5, show_default=True, help="Allocation sites reported per phase")
+    @click.option("--json", "json_path", help="Writes benchmark results as JSON ('-' for stdout)")
+    @click.option(
+        "--profile", is_flag=True, help="Profiles both tasks, writes .pstats and .collapsed files"
+    )
+    @click.option(
+        "--profile-dir",
+        default=".profiles",
+        show_default=True,
+        type=click.Path(file_okay=False, path_type=Path),
+        help="Where to write the profiles",
+    )
+    @click.option(
+        "--stream", is_flag=True, help="Solves both tasks in a single pass over the input"
+    )
+    @click.option("--mmap", "use_mmap", is_flag=True, help="Reads the input through a memory map")
+    @click.option(
+        "-v", "--verbose", "show_diagnostics", is_flag=True, help="Prints what the solutions render"
+    )
+    def solve(
+        small: bool,
+        big: bool,
+        sizes: tuple[str],
+        bench: bool,
+        repeat: int,
+        warmup: int,
+        memory: bool,
+        top: int,
+        json_path: str,
+        profile: bool,
+        profile_dir: Path,
+        stream: bool,
+        use_mmap: bool,
+        show_diagnostics: bool,
+    ):
+        instance_sizes = [
+            instance_size
+            for instance_size, selected in ((InstanceSize.SMALL, small), (InstanceSize.BIG, big))
+            if selected
+        ]
+        try:
+            instance_sizes.extend(parse_instance(size) for size in sizes)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--size")
+
+        day = int(DAY_DIRECTORY.fullmatch(directory.name).group(1))
+        if bench:
+            records = []
+            for instance_size in instance_sizes:
+                stats = benchmark_instance(puzzle, instance_size, directory, repeat, warmup)
+                records.extend(benchmark_records(day, instance_size, stats))
+
+            if json_path:
+                write_json(records, json_path)
+            if json_path != "-":
+                print(format_benchmark(records))
+            return
+
+        if memory:
+            records = []
+            for instance_size in instance_sizes:
+                stats = memory_instance(puzzle, instance_size, directory, top)
+                records.extend(memory_records(day, instance_size, stats))
 
-        if small and big:
-            print()
+            if json_path:
+                write_json(records, json_path)
+            if json_path != "-":
+                print(format_memory(records))
+            return
 
-        if big:
-            _puzzle_runner(puzzle, InstanceSize.BIG, directory)
+        if stream and not puzzle.supports_streaming():
+            raise click.UsageError(f"Day {day} can't be solved in a single pass.")
+
+        with verbose(show_diagnostics):
+            for i, instance_size in enumerate(instance_sizes):
+                if i:
+                    print()
+                if stream:
+                    _stream_runner(puzzle, instance_size, directory, use_mmap)
+                else:
+                    profile_directory = profile_dir if profile else None
+                    _puzzle_runner(puzzle, instance_size, directory, profile_directory, use_mmap)
 
     solve()
+
+
+# --- running multiple days at once ---
+
+
+@dataclass(frozen=True)
+class Unit:
+    """
+    Smallest piece of work the batch runner schedules: one task of one day on one instance.
+    """
+
+    day: int
+    instance_size: Instance
+    task: Task
+
+
+@dataclass
+class UnitResult:
+    unit: Unit
+    answer: Optional[str] = None
+    expected: Optional[str] = None
+    elapsed_ns: int = 0
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "error"
+
+        correct = check_solution(self.answer, self.expected)
+        if correct is None:
+            return "unknown"
+
+        return "pass" if correct else "fail"
+
+
+def run_unit(unit: Unit) -> UnitResult:
+    """
+    Parses the input and solves a single task, swallowing anything the solution prints.
+
+    Defined on the module level, so it can be sent to worker processes.
+    """
+    directory = PACKAGE_DIRECTORY / f"day_{unit.day:02d}"
+    result = UnitResult(unit=unit, expected=unit.instance_size.expected(directory, unit.task))
+
+    try:
+        puzzle_class = load_puzzle(unit.day)
+        lines = unit.instance_size.read_lines(directory)
+        with redirect_stdout(io.StringIO()):
+            tic = time.perf_counter_ns()
+            puzzle = puzzle_class.from_lines(lines)
+            answer = getattr(puzzle, f"task_{unit.task.value}")()
+            result.elapsed_ns = time.perf_counter_ns() - tic
+        result.answer = str(answer)
+    except Exception as e:
+        result.error = f"{e.__class__.__name__}: {e}"
+
+    return result
+
+
+def _map(func: Callable[[U], V], items: list[U], jobs: int) -> list[V]:
+    """
+    Maps in worker processes if `jobs > 1`, results keep the order of `items`.
+    """
+    if jobs <= 1:
+        return [func(item) for item in items]
+
+    # multiprocessing is the most expensive import of the runner, single day runs don't need it
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # schedule one item at a time - tasks differ in runtime by orders of magnitude
+        return list(executor.map(func, items, chunksize=1))
+
+
+def unit_key(unit: Unit) -> str:
+    """
+    Cache key of the unit, changes whenever the code of the day, including the shared modules,
+    or the input does.
+    """
+    from advent_of_code.cache import cache_key, code_digest
+
+    directory = PACKAGE_DIRECTORY / f"day_{unit.day:02d}"
+    return cache_key(
+        unit.day,
+        code_digest(directory),
+        unit.instance_size.digest(directory),
+        unit.task.value,
+    )
+
+
+def run_units(
+    units: list[Unit], jobs: int = 1, cache: Optional["ResultCache"] = None
+) -> list[UnitResult]:
+    """
+    Runs the units, only those without a cached answer when a cache is given. Cached answers are
+    verified just like the fresh ones, errors are never cached.
+    """
+    if cache is None:
+        return _map(run_unit, units, jobs)
+
+    keys = {unit: unit_key(unit) for unit in units}
+    results = {}
+    for unit, key in keys.items():
+        answer = cache.get(key)
+        if answer is not None:
+            directory = PACKAGE_DIRECTORY / f"day_{unit.day:02d}"
+            expected = unit.instance_size.expected(directory, unit.task)
+            results[unit] = UnitResult(unit=unit, answer=answer, expected=expected, cached=True)
+
+    missing = [unit for unit in units if unit not in results]
+    for result in _map(run_unit, missing, jobs):
+        results[result.unit] = result
+        if result.error is None:
+            cache.put(keys[result.unit], result.answer)
+
+    return [results[unit] for unit in units]
+
+
+def bench_unit(day_and_size: tuple[int, Instance], repeat: int = 10, warmup: int = 1) -> list[dict]:
+    """
+    Benchmarks all phases of one day on one instance, for use in worker processes.
+    """
+    day, instance_size = day_and_size
+    stats = benchmark_instance(
+        load_puzzle(day), instance_size, PACKAGE_DIRECTORY / f"day_{day:02d}", repeat, warmup
+    )
+    return benchmark_records(day, instance_size, stats)
+
+
+def bench_units(
+    days_and_sizes: list[tuple[int, Instance]], repeat: int, warmup: int, jobs: int = 1
+) -> list[dict]:
+    """
+    Benchmarks the given days, running in parallel distorts the timings if `jobs` exceeds the
+    number of idle cores.
+    """
+    results = _map(partial(bench_unit, repeat=repeat, warmup=warmup), days_and_sizes, jobs)
+    return [record for records in results for record in records]
+
+
+def memory_unit(day_and_size: tuple[int, Instance], top: int = 5) -> list[dict]:
+    day, instance_size = day_and_size
+    stats = memory_instance(
+        load_puzzle(day), instance_size, PACKAGE_DIRECTORY / f"day_{day:02d}", top
+    )
+    return memory_records(day, instance_size, stats)
+
+
+def memory_units(days_and_sizes: list[tuple[int, Instance]], top: int, jobs: int = 1) -> list[dict]:
+    results = _map(partial(memory_unit, top=top), days_and_sizes, jobs)
+    return [record for records in results for record in records]
+
+
+def _first_line(text: Optional[str]) -> str:
+    """
+    Multiline answers (e.g. day 13) would break the table.
+
+        >>> _first_line("a\\nb")
+        'a'
+
+        >>> _first_line(None)
+        ''
+    """
+    return next(iter((text or "").splitlines()), "")
+
+
+STATUS_SYMBOLS = {
+    "pass": "\U00002705",
+    "fail": "\U0000274C",
+    "unknown": "\U00002753",
+    "error": "\U0001F4A5",
+}
+
+
+def format_results(results: list[UnitResult]) -> str:
+    header = ("day", "size", "task", "status", "time", "answer")
+    rows = [
+        (
+            str(result.unit.day),
+            result.unit.instance_size.value,
+            result.unit.task.value,
+            f"{STATUS_SYMBOLS[result.status]} {result.status}",
+            "cached" if result.cached else format_ns(result.elapsed_ns),
+            "" if result.status == "pass" else _first_line(result.error or result.answer),
+        )
+        for result in results
+    ]
+
+    return format_table(header, rows)
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+import re
+import subprocess
+import sys
+
+from advent_of_code.registry import PACKAGE_DIRECTORY
+from advent_of_code.utils import format_ns, format_table
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(text: str) -> list[ImportTime]:
+    """
+    Parses the output of `python -X importtime`, nesting is given by the indentation.
+
+        >>> text = '''import time: self [us] | cumulative | imported package
+        ... import time:       120 |        120 |   _abc
+        ... import time:       310 |        430 | abc'''
+        >>> [(time.module, time.cumulative_us, time.depth) for time in parse_import_times(text)]
+        [('_abc', 120, 1), ('abc', 430, 0)]
+    """
+    times = []
+    for match in IMPORT_TIME.finditer(text):
+        self_us, cumulative_us, indent, module = match.groups()
+        times.append(ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2))
+
+    return times
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """
+    Imports the module in a fresh interpreter, so nothing is already loaded like it would be here.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PACKAGE_DIRECTORY.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    return parse_import_times(stderr)
+
+
+def startup_record(day: int, heaviest: int = 3) -> dict:
+    """
+    Cold start cost of importing the solution of the day, including everything it depends on.
+    """
+    module = f"{PACKAGE_DIRECTORY.name}.day_{day:02d}.solution"
+    times = import_times(module)
+    solution = next(time for time in times if time.module == module)
+    dependencies = sorted(
+        (time for time in times if time.module != module), key=lambda time: -time.self_us
+    )
+
+    return {
+        "day": day,
+        "total_us": solution.cumulative_us,
+        "solution_us": solution.self_us,
+        "modules": len(times),
+        "heaviest": [
+            {"module": time.module, "self_us": time.self_us} for time in dependencies[:heaviest]
+        ],
+    }
+
+
+def format_startup(records: list[dict]) -> str:
+    header = ("day", "total", "solution", "modules", "heaviest imports")
+    rows = [
+        (
+            str(record["day"]),
+            format_ns(record["total_us"] * 1000),
+            format_ns(record["solution_us"] * 1000),
+            str(record["modules"]),
+            ", ".join(
+                f"{heavy['module']} {format_ns(heavy['self_us'] * 1000)}"
+                for heavy in record["heaviest"]
+            ),
+        )
+        for record in records
+    ]
+
+    return format_table(header, rows)
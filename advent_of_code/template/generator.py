@@ -0,0 +1,10 @@
+from typing import Iterator
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Yields lines of a random input `scale` times the size of the official one.
+    """
+    rng = random.Random(seed)
+    yield from ()
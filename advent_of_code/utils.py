@@ -1,5 +1,7 @@
-from typing import Callable, Iterable, TypeVar
+from typing import Any, Callable, Iterable, Sequence, TypeVar
 from collections import defaultdict
+from importlib import import_module
+from importlib.util import find_spec
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -40,3 +42,75 @@ def invert_dictionary(dictionary: dict[K, V], key: Callable[[V], U] = identity)
         inverted[key(v)].append(k)
 
     return dict(inverted)
+
+
+def format_table(header: Sequence[str], rows: Iterable[Sequence[str]]) -> str:
+    """
+    Formats rows of strings as left-aligned columns.
+
+        >>> print(format_table(("day", "answer"), [("1", "1337"), ("12", "7")]))
+        day  answer
+        1    1337
+        12   7
+    """
+    lines = [header, *rows]
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines
+    )
+
+
+def format_ns(ns: float) -> str:
+    """
+    Formats a duration given in nanoseconds using the most readable unit.
+
+        >>> format_ns(532)
+        '532 ns'
+
+        >>> format_ns(1_234_567)
+        '1.235 ms'
+
+        >>> format_ns(61_000_000_000)
+        '61.000 s'
+
+        >>> format_ns(-2_500)
+        '-2.500 µs'
+    """
+    for unit, scale in (("s", 10**9), ("ms", 10**6), ("µs", 10**3)):
+        if abs(ns) >= scale:
+            return f"{ns / scale:.3f} {unit}"
+
+    return f"{ns:.0f} ns"
+
+
+def check_backend(backend: str, backends: Sequence[str]):
+    """
+    Rejects a backend the puzzle doesn't implement.
+
+        >>> check_backend("gpu", ("python", "numpy"))
+        Traceback (most recent call last):
+        ...
+        ValueError: Unknown backend 'gpu', use one of ('python', 'numpy').
+    """
+    if backend not in backends:
+        raise ValueError(f"Unknown backend '{backend}', use one of {backends}.")
+
+
+def import_numpy() -> Any:
+    """
+    Imports NumPy on first use, it is an optional dependency of the vectorized backends.
+    """
+    try:
+        return import_module("numpy")
+    except ImportError as e:
+        raise ImportError(
+            "NumPy backends need NumPy, install it with `poetry install -E numpy`."
+        ) from e
+
+
+def numpy_available() -> bool:
+    """
+    Whether NumPy is installed, the doctests comparing the backends pass trivially without it.
+    """
+    return find_spec("numpy") is not None